@@ -499,18 +499,11 @@ class TaskExecutor:
         metadata['hashtags'] = enhanced_hashtags
         
         # Update clip with enhanced metadata
-        self.db.execute_query(
-            """
-            UPDATE processed_clips
-            SET title = ?, description = ?, hashtags = ?
-            WHERE id = ?
-            """,
-            (
-                metadata['title'],
-                metadata['description'],
-                ','.join(metadata['hashtags']),
-                clip_id
-            )
+        self.db.update_clip_metadata(
+            clip_id,
+            metadata['title'],
+            metadata['description'],
+            metadata['hashtags']
         )
     
     async def _get_trending_hashtags(self, base_hashtags: List[str]) -> List[str]:
@@ -827,15 +820,11 @@ class TaskExecutor:
         }
         
         # Update in database
-        self.db.execute_query("""
-            UPDATE processed_clips 
-            SET title = ?, description = ?, hashtags = ?
-            WHERE id = ?
-        """, (
+        self.db.update_clip_metadata(
+            clip['id'],
             optimized_metadata['title'],
-            optimized_metadata['description'], 
-            ','.join(optimized_metadata['hashtags']),
-            clip['id']
-        ))
+            optimized_metadata['description'],
+            optimized_metadata['hashtags']
+        )
         
         return optimized_metadata
@@ -9,9 +9,12 @@ import time
 import datetime
 import re
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import googleapiclient.discovery
+import httplib2
 from googleapiclient.errors import HttpError
 import yt_dlp
 import requests
@@ -78,6 +81,7 @@ class YouTubeShortsFinder:
         self.youtube = googleapiclient.discovery.build(
             'youtube', 'v3', developerKey=api_key
         )
+        self._thread_local = threading.local()
         
         # Create download directory if it doesn't exist
         try:
@@ -97,6 +101,85 @@ class YouTubeShortsFinder:
         
         self.logger.info("YouTube Shorts finder initialized")
     
+    def _pick_search_queries(self, category):
+        """
+        Pick a random sample of search queries for a category.
+        
+        Args:
+            category (str): Category name
+            
+        Returns:
+            list: Search queries to run for the category
+        """
+        # Seleziona alcune query specifiche per questa categoria o query generiche
+        category_specific_queries = self.SEARCH_QUERIES.get(category, [])
+        
+        # Se non ci sono query specifiche per questa categoria, usa quelle generiche
+        if not category_specific_queries:
+            # Crea una lista di tutte le query da tutte le categorie
+            all_queries = []
+            for cat_queries in self.SEARCH_QUERIES.values():
+                all_queries.extend(cat_queries)
+            return random.sample(all_queries, min(3, len(all_queries)))
+        
+        # Usa le query specifiche per questa categoria
+        return random.sample(category_specific_queries, min(3, len(category_specific_queries)))
+    
+    def _get_thread_http(self):
+        """Return an HTTP connection owned by the calling thread (httplib2 is not thread-safe)."""
+        http = getattr(self._thread_local, 'http', None)
+        if http is None:
+            http = httplib2.Http(timeout=30)
+            self._thread_local.http = http
+        return http
+    
+    def _fetch_query_videos(self, full_query, published_after_rfc3339):
+        """
+        Run search.list and videos.list for a single search query.
+        
+        Args:
+            full_query (str): Full search query
+            published_after_rfc3339 (str): Lower bound for publish date
+            
+        Returns:
+            list: Raw video resources with snippet, details, statistics and status
+        """
+        self.logger.debug(f"Searching with query: '{full_query}'")
+        http = self._get_thread_http()
+        
+        # First search for shorts
+        search_response = self.youtube.search().list(
+            q=full_query,
+            type='video',
+            part='id,snippet',
+            maxResults=50,
+            videoDefinition='high',
+            videoDuration='short',  # Less than 4 minutes
+            publishedAfter=published_after_rfc3339,
+            regionCode='US',  # Can be customized based on target audience
+            relevanceLanguage=self.config['app_settings']['selected_language'],
+            order='viewCount'  # Sort by view count
+        ).execute(http=http)
+        
+        # Log the response for debugging
+        if not search_response.get('items'):
+            self.logger.debug(f"No results for query '{full_query}'. API Response: {json.dumps(search_response, indent=2)}")
+            return []
+            
+        video_ids = [item['id']['videoId'] for item in search_response.get('items', [])]
+        
+        if not video_ids:
+            self.logger.warning(f"No shorts found for query: {full_query}")
+            return []
+            
+        # Get detailed video information including statistics
+        videos_response = self.youtube.videos().list(
+            part='snippet,contentDetails,statistics,status',
+            id=','.join(video_ids)
+        ).execute(http=http)
+        
+        return videos_response.get('items', [])
+    
     def search_viral_shorts(self, max_results=50):
         """
         Search for viral YouTube Shorts based on configuration criteria.
@@ -132,62 +215,30 @@ class YouTubeShortsFinder:
         
         all_videos = []
         
+        # Issue every category query concurrently; API errors surface per category below
+        max_workers = self.config['youtube_search'].get('max_concurrent_requests', 4)
+        query_futures = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for category in categories:
+                query_futures[category] = [
+                    (query, executor.submit(
+                        self._fetch_query_videos,
+                        f"{category} {query} shorts",
+                        published_after_rfc3339
+                    ))
+                    for query in self._pick_search_queries(category)
+                ]
+
         # Search in each category
         for category in categories:
             try:
-                # Seleziona alcune query specifiche per questa categoria o query generiche
-                category_specific_queries = self.SEARCH_QUERIES.get(category, [])
-                
-                # Se non ci sono query specifiche per questa categoria, usa quelle generiche
-                if not category_specific_queries:
-                    # Crea una lista di tutte le query da tutte le categorie
-                    all_queries = []
-                    for cat_queries in self.SEARCH_QUERIES.values():
-                        all_queries.extend(cat_queries)
-                    search_queries = random.sample(all_queries, min(3, len(all_queries)))
-                else:
-                    # Usa le query specifiche per questa categoria
-                    search_queries = random.sample(category_specific_queries, min(3, len(category_specific_queries)))
-                
                 category_videos = []
                 
-                for query in search_queries:
-                    full_query = f"{category} {query} shorts"
-                    self.logger.debug(f"Searching with query: '{full_query}'")
-                    
-                    # First search for shorts
-                    search_response = self.youtube.search().list(
-                        q=full_query,
-                        type='video',
-                        part='id,snippet',
-                        maxResults=50,
-                        videoDefinition='high',
-                        videoDuration='short',  # Less than 4 minutes
-                        publishedAfter=published_after_rfc3339,
-                        regionCode='US',  # Can be customized based on target audience
-                        relevanceLanguage=self.config['app_settings']['selected_language'],
-                        order='viewCount'  # Sort by view count
-                    ).execute()
-                    
-                    # Log the response for debugging
-                    if not search_response.get('items'):
-                        self.logger.debug(f"No results for query '{full_query}'. API Response: {json.dumps(search_response, indent=2)}")
-                        continue
-                        
-                    video_ids = [item['id']['videoId'] for item in search_response.get('items', [])]
-                    
-                    if not video_ids:
-                        self.logger.warning(f"No shorts found for query: {full_query}")
-                        continue
-                        
-                    # Get detailed video information including statistics
-                    videos_response = self.youtube.videos().list(
-                        part='snippet,contentDetails,statistics,status',
-                        id=','.join(video_ids)
-                    ).execute()
+                for query, future in query_futures[category]:
+                    videos = future.result()
                     
                     # Filter for vertical shorts with enough views
-                    for video in videos_response.get('items', []):
+                    for video in videos:
                         try:
                             # Extract view count
                             view_count = int(video['statistics'].get('viewCount', 0))
@@ -297,9 +348,6 @@ class YouTubeShortsFinder:
                             category_videos.append(video_data)
                         except Exception as e:
                             self.logger.warning(f"Error processing video {video.get('id', 'unknown')}: {e}")
-                    
-                    # Avoid API rate limits
-                    time.sleep(1)
                 
                 # Aggiungi tutti i video trovati per questa categoria
                 all_videos.extend(category_videos)
@@ -40,6 +40,8 @@ class Database:
         try:
             self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            # WAL lets readers (uploader, dashboard) run alongside the writer; the mode is persistent
+            self.conn.execute("PRAGMA journal_mode=WAL")
             self.cursor = self.conn.cursor()
             self.logger.info(f"Connected to database at {self.db_path}")
         except sqlite3.Error as e:
@@ -92,7 +94,18 @@ class Database:
                 FOREIGN KEY (source_id) REFERENCES source_videos (id) ON DELETE CASCADE
             )
             ''')
-            
+
+            # Hashtags table (one row per clip/tag, for set-based queries)
+            self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS hashtags (
+                clip_id INTEGER,
+                tag TEXT,
+                PRIMARY KEY (clip_id, tag),
+                FOREIGN KEY (clip_id) REFERENCES processed_clips (id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+            ''')
+            self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_hashtags_tag ON hashtags (tag)')
+
             # Uploaded videos table (videos uploaded to YouTube)
             self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS uploaded_videos (
@@ -169,11 +182,96 @@ class Database:
             ''')
             
             self.conn.commit()
+            self._migrate_hashtags()
             self.logger.info("Database tables created successfully")
         except sqlite3.Error as e:
             self.logger.error(f"Error creating database tables: {e}")
             raise
-            
+
+    def _migrate_hashtags(self):
+        """Populate the hashtags table for clips whose comma-separated hashtags were never indexed."""
+        self.cursor.execute(
+            """
+            SELECT id, hashtags FROM processed_clips
+            WHERE hashtags IS NOT NULL AND hashtags != ''
+              AND id NOT IN (SELECT clip_id FROM hashtags)
+            """
+        )
+        rows = [
+            (row['id'], tag.strip())
+            for row in self.cursor.fetchall()
+            for tag in row['hashtags'].split(',')
+            if tag.strip()
+        ]
+        if rows:
+            self.execute_many("INSERT OR IGNORE INTO hashtags (clip_id, tag) VALUES (?, ?)", rows)
+            self.logger.info(f"Migrated {len(rows)} clip hashtags")
+
+    def set_clip_hashtags(self, clip_id, tags):
+        """
+        Replace the hashtags stored for a clip.
+
+        Args:
+            clip_id (int): ID of the processed clip
+            tags (list): List of hashtags
+        """
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM hashtags WHERE clip_id = ?", (clip_id,))
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO hashtags (clip_id, tag) VALUES (?, ?)",
+                    [(clip_id, tag) for tag in tags if tag]
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Error setting clip hashtags: {e}")
+            raise
+
+    def update_clips_metadata(self, clips):
+        """
+        Store generated title, description and hashtags for several clips
+        in a single transaction, keeping the hashtags table in sync.
+
+        Args:
+            clips (iterable): (clip_id, title, description, hashtags list) tuples
+        """
+        clips = list(clips)
+        if not clips:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    """
+                    UPDATE processed_clips
+                    SET title = ?, description = ?, hashtags = ?
+                    WHERE id = ?
+                    """,
+                    [(title, description, ','.join(tags), clip_id)
+                     for clip_id, title, description, tags in clips]
+                )
+                self.conn.executemany(
+                    "DELETE FROM hashtags WHERE clip_id = ?",
+                    [(clip_id,) for clip_id, _, _, _ in clips]
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO hashtags (clip_id, tag) VALUES (?, ?)",
+                    [(clip_id, tag) for clip_id, _, _, tags in clips for tag in tags if tag]
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Error updating clip metadata: {e}")
+            raise
+
+    def update_clip_metadata(self, clip_id, title, description, hashtags):
+        """
+        Store generated title, description and hashtags for a clip.
+
+        Args:
+            clip_id (int): ID of the processed clip
+            title (str): Clip title
+            description (str): Clip description
+            hashtags (list): List of hashtags
+        """
+        self.update_clips_metadata([(clip_id, title, description, hashtags)])
+
     def add_source_video(self, video_data):
         """
         Add a new source video to the database.
@@ -240,8 +338,10 @@ class Database:
         """
         try:
             # Convert hashtags list to comma-separated string
+            tags = None
             if 'hashtags' in clip_data and isinstance(clip_data['hashtags'], list):
-                clip_data['hashtags'] = ','.join(clip_data['hashtags'])
+                tags = clip_data['hashtags']
+                clip_data['hashtags'] = ','.join(tags)
                 
             # Ensure created_at is set
             if 'created_at' not in clip_data:
@@ -260,6 +360,8 @@ class Database:
             self.conn.commit()
             
             clip_id = self.cursor.lastrowid
+            if tags:
+                self.set_clip_hashtags(clip_id, tags)
             self.logger.info(f"Added processed clip with ID: {clip_id}")
             return clip_id
         except sqlite3.Error as e:
@@ -718,7 +820,26 @@ class Database:
                 self.conn.rollback()
             self.logger.error(f"Error executing query: {e}")
             raise
-    
+
+    def execute_many(self, query, params_seq):
+        """
+        Execute a write query for every parameter tuple in a single transaction.
+
+        Args:
+            query (str): SQL query to execute
+            params_seq (iterable): Sequence of parameter tuples
+
+        Returns:
+            int: Number of rows affected
+        """
+        try:
+            with self.conn:
+                cursor = self.conn.executemany(query, params_seq)
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            self.logger.error(f"Error executing batch query: {e}")
+            raise
+
     def get_videos_ready_for_upload(self, limit=5):
         """
         Ottieni video pronti per l'upload automatico.
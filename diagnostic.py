@@ -238,11 +238,12 @@ def launch_application():
         # Importa ed esegui l'applicazione principale
         print_colored("\nAvvio dell'applicazione principale...", 'INFO')
         
-        # Rimuovi eventuale file pickle delle credenziali per forzare la riautenticazione
-        token_pickle = os.path.join('data', 'token.pickle')
-        if os.path.exists(token_pickle):
-            os.remove(token_pickle)
-            print_colored("File token.pickle rimosso per forzare una nuova autenticazione", 'INFO')
+        # Rimuovi eventuali token salvati (JSON o vecchio pickle) per forzare la riautenticazione
+        for token_name in ('token.json', 'token.pickle'):
+            token_path = os.path.join('data', token_name)
+            if os.path.exists(token_path):
+                os.remove(token_path)
+                print_colored(f"File {token_name} rimosso per forzare una nuova autenticazione", 'INFO')
         
         # Avvia l'applicazione
         import main
@@ -136,6 +136,7 @@ class ViralShortsWorker(QThread):
         try:
             # Esegui diagnosi di sistema
             app_logger.debug("[DIAGNOSTIC] Avvio diagnostica di sistema")
+            app_logger.run_system_diagnostics()
             app_logger.log_system_info()
             
             # Stampa il contenuto attuale della configurazione per debug
@@ -436,18 +437,11 @@ class ViralShortsWorker(QThread):
                         )
                         
                         # Update clip with metadata
-                        self.db.execute_query(
-                            """
-                            UPDATE processed_clips
-                            SET title = ?, description = ?, hashtags = ?
-                            WHERE id = ?
-                            """,
-                            (
-                                metadata['title'],
-                                metadata['description'],
-                                ','.join(metadata['hashtags']),
-                                clip_id
-                            )
+                        self.db.update_clip_metadata(
+                            clip_id,
+                            metadata['title'],
+                            metadata['description'],
+                            metadata['hashtags']
                         )
                         
                         processed_clips.append(clip_id)
@@ -664,18 +658,11 @@ class ViralShortsWorker(QThread):
                 )
                 
                 # Update clip with metadata
-                self.db.execute_query(
-                    """
-                    UPDATE processed_clips
-                    SET title = ?, description = ?, hashtags = ?
-                    WHERE id = ?
-                    """,
-                    (
-                        metadata['title'],
-                        metadata['description'],
-                        ','.join(metadata['hashtags']),
-                        clip_id
-                    )
+                self.db.update_clip_metadata(
+                    clip_id,
+                    metadata['title'],
+                    metadata['description'],
+                    metadata['hashtags']
                 )
                 
                 processed_clips.append(clip_id)
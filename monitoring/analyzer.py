@@ -108,11 +108,15 @@ class PerformanceAnalyzer:
             
             updated_count = 0
             
+            # Get analytics from YouTube (up to 50 videos per API call)
+            all_analytics = uploader.get_video_analytics_batch(
+                [video['youtube_id'] for video in videos]
+            ) or {}
+            
             for video in videos:
                 try:
-                    # Get analytics from YouTube
                     youtube_id = video['youtube_id']
-                    analytics = uploader.get_video_analytics(youtube_id)
+                    analytics = all_analytics.get(youtube_id)
                     
                     if not analytics:
                         self.logger.warning(f"No analytics available for {youtube_id}")
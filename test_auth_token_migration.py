@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test della migrazione una tantum del token OAuth da pickle a JSON
+in youtube_auth_manager, senza rete né browser.
+"""
+
+import os
+import sys
+import pickle
+import tempfile
+from pathlib import Path
+
+# Add the parent directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import youtube_auth_manager as auth
+from google.oauth2.credentials import Credentials
+
+
+def test_legacy_pickle_token_is_migrated_to_json():
+    """Un token.pickle esistente viene caricato, riscritto come JSON e rimosso."""
+    saved = (auth.TOKEN_FILE, auth.LEGACY_TOKEN_FILE)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        auth.TOKEN_FILE = os.path.join(tmp_dir, 'token.json')
+        auth.LEGACY_TOKEN_FILE = os.path.join(tmp_dir, 'token.pickle')
+        auth._TOKEN_CACHE.update(creds=None, mtime=None)
+        try:
+            legacy = Credentials(
+                'access-token',
+                refresh_token='refresh-token',
+                token_uri='https://oauth2.googleapis.com/token',
+                client_id='client-id',
+                client_secret='client-secret',
+                scopes=auth.SCOPES
+            )
+            with open(auth.LEGACY_TOKEN_FILE, 'wb') as f:
+                pickle.dump(legacy, f)
+
+            credentials = auth.load_token()
+            assert credentials.refresh_token == 'refresh-token'
+            assert os.path.exists(auth.TOKEN_FILE)
+            assert not os.path.exists(auth.LEGACY_TOKEN_FILE)
+
+            # Il caricamento successivo legge il JSON appena scritto
+            auth._TOKEN_CACHE.update(creds=None, mtime=None)
+            reloaded = auth.load_token()
+            assert reloaded.refresh_token == 'refresh-token'
+            assert reloaded.client_id == 'client-id'
+        finally:
+            auth.TOKEN_FILE, auth.LEGACY_TOKEN_FILE = saved
+            auth._TOKEN_CACHE.update(creds=None, mtime=None)
+    print("✅ Token pickle migrato a JSON e rimosso")
+
+
+def test_missing_token_returns_none():
+    """Senza token JSON né pickle load_token restituisce None."""
+    saved = (auth.TOKEN_FILE, auth.LEGACY_TOKEN_FILE)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        auth.TOKEN_FILE = os.path.join(tmp_dir, 'token.json')
+        auth.LEGACY_TOKEN_FILE = os.path.join(tmp_dir, 'token.pickle')
+        auth._TOKEN_CACHE.update(creds=None, mtime=None)
+        try:
+            assert auth.load_token() is None
+        finally:
+            auth.TOKEN_FILE, auth.LEGACY_TOKEN_FILE = saved
+    print("✅ Nessun token: load_token restituisce None")
+
+
+if __name__ == "__main__":
+    test_legacy_pickle_token_is_migrated_to_json()
+    test_missing_token_returns_none()
+    print("🎉 Test migrazione token completati")
@@ -9,6 +9,7 @@ import sys
 import json
 import traceback
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add the project root to the path
@@ -50,6 +51,11 @@ def test_single_video_mode():
             config = json.load(f)
         print("✅ Configurazione caricata")
         
+        # Avvia il caricamento del modello Whisper in background: si sovrappone al download
+        whisper_executor = ThreadPoolExecutor(max_workers=1)
+        whisper_future = whisper_executor.submit(WhisperTranscriber, config)
+        whisper_executor.shutdown(wait=False)
+        
         # Step 3: Inizializza componenti
         print("📋 Inizializzazione componenti...")
         
@@ -60,9 +66,6 @@ def test_single_video_mode():
         finder = YouTubeShortsFinder(config, db)
         print("✅ YouTube Finder inizializzato")
         
-        transcriber = WhisperTranscriber(config)
-        print("✅ Whisper Transcriber inizializzato")
-        
         captioner = GPTCaptioner(config)
         print("✅ GPT Captioner inizializzato")
         
@@ -89,6 +92,9 @@ def test_single_video_mode():
         print("🔄 FASE 2: TRASCRIZIONE VIDEO")
         print("="*50)
         
+        transcriber = whisper_future.result()
+        print("✅ Whisper Transcriber inizializzato")
+        
         language = config['app_settings']['selected_language']
         print(f"📋 Trascrizione in linguaggio: {language}")
         
@@ -145,6 +151,7 @@ def test_single_video_mode():
         print("="*50)
         
         processed_clips = []
+        update_rows = []
         for i, clip_id in enumerate(clip_ids):
             print(f"📋 Elaborazione metadata clip {i+1}/{len(clip_ids)}")
             
@@ -169,24 +176,14 @@ def test_single_video_mode():
             # Generate metadata
             metadata = captioner.generate_video_metadata(clip, clip_transcription)
             
-            # Update clip with metadata
-            db.execute_query(
-                """
-                UPDATE processed_clips
-                SET title = ?, description = ?, hashtags = ?
-                WHERE id = ?
-                """,
-                (
-                    metadata['title'],
-                    metadata['description'],
-                    ','.join(metadata['hashtags']),
-                    clip_id
-                )
-            )
-            
+            # Queue clip update (written in a single transaction below)
+            update_rows.append((clip_id, metadata['title'], metadata['description'], metadata['hashtags']))
+
             processed_clips.append(clip_id)
             print(f"   ✅ Clip {clip_id}: {metadata['title']}")
-        
+
+        db.update_clips_metadata(update_rows)
+
         # Step 9: Genera report
         print("\n" + "="*50)
         print("🔄 FASE 6: GENERAZIONE REPORT")
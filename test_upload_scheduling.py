@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test della pianificazione degli upload (YouTubeUploader), senza rete né credenziali.
+"""
+
+import sys
+import datetime
+import tempfile
+import threading
+from pathlib import Path
+
+# Add the parent directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from database import Database
+from upload.youtube_uploader import YouTubeUploader
+
+
+def _make_uploader(tmp_dir, upload_times):
+    """Crea un uploader con percorsi temporanei e gli orari di upload indicati."""
+    config = {
+        'paths': {
+            'database': str(Path(tmp_dir) / 'viral_shorts.db'),
+            'uploads': str(Path(tmp_dir) / 'uploads')
+        },
+        'upload': {
+            'upload_times': upload_times,
+            'visibility': 'private',
+            'prewarm': False
+        }
+    }
+    return YouTubeUploader(config)
+
+
+def test_next_slot_uses_configured_times():
+    """Il prossimo slot è il primo orario dopo adesso, altrimenti il primo di domani."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        uploader = _make_uploader(tmp_dir, ['18:00', '09:30'])
+
+        morning = datetime.datetime(2024, 5, 1, 8, 0)
+        assert uploader._next_slot(morning) == datetime.datetime(2024, 5, 1, 9, 30)
+
+        afternoon = datetime.datetime(2024, 5, 1, 12, 0)
+        assert uploader._next_slot(afternoon) == datetime.datetime(2024, 5, 1, 18, 0)
+
+        night = datetime.datetime(2024, 5, 1, 23, 0)
+        assert uploader._next_slot(night) == datetime.datetime(2024, 5, 2, 9, 30)
+    print("✅ Slot successivo calcolato dagli orari configurati")
+
+
+def test_next_slot_falls_back_when_no_time_parses():
+    """Orari tutti non validi: domani alle 12:00, come prima della riscrittura con bisect."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        uploader = _make_uploader(tmp_dir, ['25:99', 'mezzogiorno'])
+        assert uploader._upload_times == []
+
+        now = datetime.datetime(2024, 5, 1, 8, 0)
+        assert uploader._next_slot(now) == datetime.datetime(2024, 5, 2, 12, 0)
+    print("✅ Fallback a domani alle 12:00 con orari non validi")
+
+
+def test_check_scheduled_uploads_uploads_due_rows_once():
+    """Solo le righe scadute vengono caricate, una volta; il database si aggiorna sul thread chiamante."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        uploader = _make_uploader(tmp_dir, ['12:00'])
+        db = Database(uploader.config['paths']['database'])
+        try:
+            video_file = Path(tmp_dir) / 'clip.mp4'
+            video_file.write_bytes(b'\x00' * 16)
+
+            source_id = db.add_source_video({
+                'youtube_id': 'src123',
+                'title': 'Sorgente',
+                'channel': 'Canale Originale',
+                'metadata': {'channel_id': 'UC123'}
+            })
+            clip_id = db.add_processed_clip({
+                'source_id': source_id,
+                'file_path': str(video_file),
+                'title': 'Clip',
+                'hashtags': ['#a', '#b']
+            })
+
+            now = datetime.datetime.now()
+            rows = [
+                ('Scaduto', now - datetime.timedelta(minutes=10), None),
+                ('Futuro', now + datetime.timedelta(hours=2), None),
+                ('Già caricato', now - datetime.timedelta(hours=1), 'yt_done')
+            ]
+            for title, scheduled_time, youtube_id in rows:
+                db.execute_query(
+                    """
+                    INSERT INTO uploaded_videos
+                        (clip_id, youtube_id, title, description, hashtags, scheduled_time, visibility)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (clip_id, youtube_id, title, 'Descrizione', '#a,#b',
+                     scheduled_time.isoformat(), 'private')
+                )
+
+            # Servizio YouTube simulato: registra le chiamate invece di caricare
+            uploads = []
+
+            def fake_upload_video(video_path, title, description, tags=None,
+                                  visibility='public', source_video_data=None, **kwargs):
+                uploads.append((title, tags, source_video_data['channel_title']))
+                return {
+                    'youtube_id': f"yt_{len(uploads)}",
+                    'url': f"https://www.youtube.com/watch?v=yt_{len(uploads)}",
+                    'upload_time': datetime.datetime.now().isoformat()
+                }
+
+            uploader.youtube = object()  # già autenticato: nessun flusso OAuth
+            uploader.upload_video = fake_upload_video
+
+            # Registra il thread di ogni scrittura sul database
+            write_threads = []
+            execute_query = db.execute_query
+
+            def recording_execute_query(query, params=None):
+                if query.strip().upper().startswith('UPDATE'):
+                    write_threads.append(threading.get_ident())
+                return execute_query(query, params)
+
+            db.execute_query = recording_execute_query
+
+            uploaded = uploader.check_scheduled_uploads(db)
+            assert len(uploaded) == 1
+            assert uploads == [('Scaduto', ['#a', '#b'], 'Canale Originale')]
+            assert write_threads == [threading.get_ident()]
+
+            row = execute_query(
+                "SELECT youtube_id FROM uploaded_videos WHERE id = ?", (uploaded[0],)
+            )[0]
+            assert row['youtube_id'] == 'yt_1'
+
+            # Un secondo controllo non ricarica nulla
+            assert uploader.check_scheduled_uploads(db) == []
+            assert len(uploads) == 1
+        finally:
+            db.close()
+            uploader.close()
+    print("✅ Upload pianificati eseguiti una sola volta, aggiornamenti sul thread chiamante")
+
+
+if __name__ == "__main__":
+    test_next_slot_uses_configured_times()
+    test_next_slot_falls_back_when_no_time_parses()
+    test_check_scheduled_uploads_uploads_due_rows_once()
+    print("🎉 Test pianificazione upload completati")
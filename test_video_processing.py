@@ -6,11 +6,14 @@ Test script per processare video esistenti senza fare nuove ricerche
 import os
 import sys
 import json
+import logging
 from pathlib import Path
 
 # Aggiungi la directory root al Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+logger = logging.getLogger("ViralShortsAI.tests")
+
 def test_existing_videos():
     """Test processamento video esistenti nel database"""
     print("🔧 Test processamento video esistenti...")
@@ -80,10 +83,8 @@ def test_existing_videos():
             
         return True
         
-    except Exception as e:
-        print(f"❌ Errore test video esistenti: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("❌ Errore test video esistenti")
         return False
 
 def test_process_workflow():
@@ -161,17 +162,13 @@ def test_process_workflow():
                 print(f"✅ Clip generate: {len(clips)}")
             else:
                 print("❌ Nessuna clip generata")
-        except Exception as e:
-            print(f"❌ Errore elaborazione clip: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("❌ Errore elaborazione clip")
             
         return True
         
-    except Exception as e:
-        print(f"❌ Errore workflow test: {e}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("❌ Errore workflow test")
         return False
 
 def main():
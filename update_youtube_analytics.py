@@ -91,12 +91,13 @@ class YouTubeAnalyticsUpdater:
             return False
     
     def get_current_analytics(self):
-        """Ottieni analytics attuali dal database"""
+        """Itera le analytics attuali dal database (righe sqlite3.Row in streaming)"""
+        conn = None
         try:
             conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            conn.row_factory = sqlite3.Row
             
-            cursor.execute('''
+            yield from conn.execute('''
                 SELECT 
                     uv.youtube_id,
                     uv.title,
@@ -109,14 +110,11 @@ class YouTubeAnalyticsUpdater:
                 ORDER BY a.timestamp DESC
             ''')
             
-            results = cursor.fetchall()
-            conn.close()
-            
-            return results
-            
         except Exception as e:
             self.logger.error(f"Errore ottenimento analytics: {e}")
-            return []
+        finally:
+            if conn is not None:
+                conn.close()
     
     def update_real_analytics(self):
         """Aggiorna analytics con dati reali (manuale per ora)"""
@@ -148,11 +146,10 @@ def main():
     print("\n📊 Analytics Attuali:")
     analytics = updater.get_current_analytics()
     
-    for record in analytics:
-        youtube_id, title, views, likes, comments, timestamp = record
-        print(f"   📹 {title[:40]}...")
-        print(f"       Views: {views}, Likes: {likes}, Comments: {comments}")
-        print(f"       Ultimo aggiornamento: {timestamp}")
+    for row in analytics:
+        print(f"   📹 {row['title'][:40]}...")
+        print(f"       Views: {row['views']}, Likes: {row['likes']}, Comments: {row['comments']}")
+        print(f"       Ultimo aggiornamento: {row['timestamp']}")
     
     # Aggiorna dati
     print("\n🔄 Aggiornamento in corso...")
@@ -162,11 +159,10 @@ def main():
     print("\n📊 Analytics Aggiornati:")
     analytics = updater.get_current_analytics()
     
-    for record in analytics:
-        youtube_id, title, views, likes, comments, timestamp = record
-        print(f"   📹 {title[:40]}...")
-        print(f"       Views: {views}, Likes: {likes}, Comments: {comments}")
-        print(f"       Ultimo aggiornamento: {timestamp}")
+    for row in analytics:
+        print(f"   📹 {row['title'][:40]}...")
+        print(f"       Views: {row['views']}, Likes: {row['likes']}, Comments: {row['comments']}")
+        print(f"       Ultimo aggiornamento: {row['timestamp']}")
 
 if __name__ == "__main__":
     main()
@@ -5,22 +5,53 @@ Handles authentication and uploading videos to YouTube.
 
 import os
 import time
+import contextlib
+import itertools
+import bisect
 import random
 import datetime
+import socket
+import threading
+import concurrent.futures
 import http.client
 import httplib2
-import json
+import logging
+import mimetypes
+import sqlite3
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import orjson
+    
+    def _loads(data):
+        return orjson.loads(data)
+    
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+    
+    def _loads(data):
+        return json.loads(data)
+    
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 import google.oauth2.credentials
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 from googleapiclient.errors import HttpError
 
-from utils import app_logger
+from utils import app_logger, load_json_cached
 
 class YouTubeUploader:
     """
@@ -38,6 +69,11 @@ class YouTubeUploader:
     API_SERVICE_NAME = 'youtube'
     API_VERSION = 'v3'
     
+    # HTTP status codes worth retrying during an upload
+    RETRIABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+    # Resumable upload path, relative to the client's rootUrl
+    UPLOAD_PATH = 'upload/youtube/v3/videos?uploadType=resumable'
+    
     def __init__(self, config):
         """
         Initialize the YouTube uploader.
@@ -51,163 +87,362 @@ class YouTubeUploader:
         # Directory for storing credentials
         # Use the parent directory of the database as the data directory
         self.credentials_dir = Path(os.path.dirname(self.config['paths'].get('database', 'data/viral_shorts.db')))
-        self.credentials_dir.mkdir(parents=True, exist_ok=True)
+        if not self.credentials_dir.exists():
+            self.credentials_dir.mkdir(parents=True, exist_ok=True)
         self.credentials_path = self.credentials_dir / 'youtube_credentials.json'
         
         # Upload directory
         self.uploads_dir = Path(self.config['paths'].get('uploads', 'data/uploads'))
-        self.uploads_dir.mkdir(parents=True, exist_ok=True)
+        if not self.uploads_dir.exists():
+            self.uploads_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Resumable upload chunk size (must be a multiple of 256 KB)
+        self.chunksize = self.config['upload'].get('chunksize', 8 * 1024 * 1024)
+        
+        # Parse daily upload times once
+        self._upload_times = []
+        for time_str in self.config['upload'].get('upload_times', []):
+            try:
+                hour, minute = map(int, time_str.split(':'))
+                self._upload_times.append(datetime.time(hour=hour, minute=minute))
+            except Exception as e:
+                self.logger.warning(f"Invalid upload time format: {time_str} - {e}")
+        self._upload_times.sort()
+        
+        # Pooled HTTP connection shared by every API call (keeps TCP+TLS alive)
+        self._http = httplib2.Http(cache=None, timeout=60)
+        self._authed_http = None
+        self._credentials = None
+        self._local = threading.local()
+        
+        # Optional OAuth client pool for quota rotation
+        self._client_pool = self._load_client_pool()
+        self._next_client = itertools.cycle(self._client_pool)
+        self._pool_lock = threading.Lock()
+        
+        # Serializes the lazy token refresh between worker threads
+        self._refresh_lock = threading.Lock()
+        
+        # Persistent database connection (opened lazily), shared by worker threads
+        self._db_connection = None
+        self._db_lock = threading.Lock()
         
         # Initialize YouTube API client
         self.youtube = None
         self.logger.info("YouTube uploader initialized")
     
-    def authenticate(self):
+    def _build_service(self, credentials):
         """
-        Authenticate with YouTube API using OAuth2.
-        Handles token refresh and initial setup.
+        Build the YouTube API client on top of the pooled HTTP connection.
         
-        Returns:
-            bool: True if authentication successful
+        Args:
+            credentials: Google OAuth2 credentials
         """
-        try:
-            credentials = None
+        self._credentials = credentials
+        self._authed_http = AuthorizedHttp(credentials, http=self._http)
+        self._local.authed_http = self._authed_http
+        self.youtube = build(
+            self.API_SERVICE_NAME,
+            self.API_VERSION,
+            http=self._authed_http,
+            static_discovery=True,  # Discovery document bundled with google-api-python-client
+            cache_discovery=False
+        )
+    
+    def _save_credentials(self, credentials):
+        """
+        Save credentials to disk for the next run.
+        
+        Args:
+            credentials: Google OAuth2 credentials
+        """
+        # Assicura che la directory esista
+        self.credentials_dir.mkdir(parents=True, exist_ok=True)
+        
+        creds_dict = {
+            'token': credentials.token,
+            'refresh_token': credentials.refresh_token,
+            'token_uri': credentials.token_uri,
+            'client_id': credentials.client_id,
+            'client_secret': credentials.client_secret,
+            'scopes': credentials.scopes,
+            # Scadenza (UTC naive, come google-auth) per evitare refresh inutili al riavvio
+            'expiry': credentials.expiry.isoformat() if credentials.expiry else None
+        }
+        
+        # Scrive su un file temporaneo e lo sostituisce atomicamente:
+        # un crash a metà scrittura non corrompe le credenziali esistenti.
+        # Il file nasce già con permessi 0o600 (ignorati su Windows), senza
+        # finestra in cui il refresh token sia leggibile da altri utenti
+        tmp_path = self.credentials_path.with_suffix('.tmp')
+        with self._credentials_lock():
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_path)  # residuo di un crash, magari con altri permessi
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_dumps(creds_dict))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.credentials_path)
+    
+    @contextlib.contextmanager
+    def _credentials_lock(self):
+        """
+        Hold an exclusive cross-process lock on the credentials file (no-op without fcntl).
+        Only held while the file is read or written, never across network calls
+        or the interactive OAuth flow; not reentrant.
+        """
+        if fcntl is None:
+            yield
+            return
+        
+        self.credentials_dir.mkdir(parents=True, exist_ok=True)
+        with open(f"{self.credentials_path}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _ensure_fresh_credentials(self):
+        """
+        Refresh the access token when it expires within 5 minutes and persist it.
+        Called before API calls instead of running a background timer, so
+        uploaders that are never closed leave no refresh thread behind.
+        """
+        credentials = self._credentials
+        if credentials is None or not credentials.expiry or not credentials.refresh_token:
+            return
+        
+        threshold = datetime.timedelta(minutes=5)
+        # google-auth stores expiry as naive UTC
+        if credentials.expiry - datetime.datetime.utcnow() > threshold:
+            return
+        
+        with self._refresh_lock:
+            # Another thread may have refreshed while we waited
+            if credentials.expiry - datetime.datetime.utcnow() > threshold:
+                return
+            try:
+                credentials.refresh(Request())
+            except Exception as e:
+                self.logger.warning(f"Aggiornamento delle credenziali fallito: {e}")
+                return
             
-            # Controlla prima se esiste un token di refresh nell'ambiente
-            env_refresh_token = os.getenv('YOUTUBE_REFRESH_TOKEN')
+            try:
+                self._save_credentials(credentials)
+                self.logger.info("Credenziali YouTube aggiornate")
+            except Exception as e:
+                self.logger.warning(f"Errore nel salvataggio delle credenziali su disco: {e}")
+    
+    def _db_fetchone(self, query, params=()):
+        """
+        Run a read query on the persistent application database connection,
+        opening it on first use. The connection is shared across threads,
+        so every use goes through _db_lock.
+        
+        Args:
+            query (str): SQL query
+            params (tuple): Query parameters
             
-            # Controlla se il file delle credenziali esiste
-            if self.credentials_path.exists():
-                try:
-                    # Carica credenziali dal file
-                    with open(self.credentials_path, 'r') as f:
-                        creds_data = json.load(f)
-                        credentials = Credentials.from_authorized_user_info(
-                            creds_data, self.SCOPES
-                        )
-                        self.logger.info("Credenziali caricate dal file")
-                        
-                        # Se esiste un token nell'ambiente ed è diverso da quello nel file, usa quello dell'ambiente
-                        if env_refresh_token and env_refresh_token != credentials.refresh_token:
-                            self.logger.info("Token di refresh nell'ambiente diverso dal file, uso quello dell'ambiente")
-                            credentials.refresh_token = env_refresh_token
-                except Exception as e:
-                    self.logger.error(f"Errore nel caricamento delle credenziali: {e}")
+        Returns:
+            sqlite3.Row: First row, or None
+        """
+        with self._db_lock:
+            if self._db_connection is None:
+                conn = sqlite3.connect(self.config['paths']['database'], check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                self._db_connection = conn
+            return self._db_connection.execute(query, params).fetchone()
+    
+    def close(self):
+        """Close the database connection."""
+        with self._db_lock:
+            if self._db_connection is not None:
+                self._db_connection.close()
+                self._db_connection = None
+    
+    def _retry_delay(self, retry_count, retry_after=None):
+        """
+        Compute a jittered exponential backoff delay, capped at 60 seconds
+        but never shorter than a server-provided Retry-After.
+        
+        Args:
+            retry_count (int): Number of failed attempts so far
+            retry_after (str, optional): Retry-After header value in seconds
             
-            # Se non ci sono credenziali ma c'è un token di refresh nell'ambiente, crea le credenziali
-            if not credentials and env_refresh_token:
-                self.logger.info("Creazione credenziali dal token di refresh nell'ambiente")
-                client_id = os.getenv('YOUTUBE_CLIENT_ID')
-                client_secret = os.getenv('YOUTUBE_CLIENT_SECRET')
-                
-                if not client_id or not client_secret:
-                    self.logger.error(
-                        "Client ID o Secret YouTube non trovati nelle variabili d'ambiente"
-                    )
-                    return False
-                    
-                credentials = Credentials(
-                    None,  # Nessun access token
-                    refresh_token=env_refresh_token,
-                    token_uri="https://oauth2.googleapis.com/token",
-                    client_id=client_id,
-                    client_secret=client_secret,
-                    scopes=self.SCOPES
+        Returns:
+            float: Seconds to wait before retrying
+        """
+        try:
+            retry_after = int(retry_after or 0)
+        except ValueError:
+            retry_after = 0
+        
+        return max(retry_after, min(60, 2 ** retry_count)) + random.uniform(0, 1)
+    
+    def _get_authed_http(self):
+        """
+        Get the authorized HTTP connection for the calling thread.
+        httplib2 is not thread-safe, so worker threads get their own connection.
+        
+        Returns:
+            AuthorizedHttp: Authorized HTTP connection
+        """
+        authed_http = getattr(self._local, 'authed_http', None)
+        if authed_http is None or authed_http.credentials is not self._credentials:
+            authed_http = AuthorizedHttp(self._credentials, http=httplib2.Http(cache=None, timeout=60))
+            self._local.authed_http = authed_http
+        return authed_http
+    
+    def _obtain_credentials(self):
+        """
+        Load, refresh or interactively create YouTube credentials and save them.
+        
+        Returns:
+            Credentials: Valid credentials, or None if they could not be obtained
+        """
+        credentials = None
+        
+        # Controlla prima se esiste un token di refresh nell'ambiente
+        env_refresh_token = os.getenv('YOUTUBE_REFRESH_TOKEN')
+        
+        # Controlla se il file delle credenziali esiste
+        if self.credentials_path.exists():
+            try:
+                # Carica credenziali dal file (sotto lock: un altro processo potrebbe riscriverlo)
+                with self._credentials_lock():
+                    with open(self.credentials_path, 'rb') as f:
+                        creds_data = _loads(f.read())
+                credentials = Credentials.from_authorized_user_info(
+                    creds_data, self.SCOPES
                 )
-            
-            # Verifica se le credenziali sono valide
-            if credentials and credentials.valid:
-                self.logger.info("Uso credenziali YouTube esistenti e valide")
-            elif credentials and credentials.expired and credentials.refresh_token:
-                try:
-                    # Refresh del token
-                    self.logger.info("Aggiornamento credenziali YouTube scadute")
-                    credentials.refresh(Request())
-                    self.logger.info("Credenziali aggiornate con successo")
-                except Exception as e:
-                    self.logger.error(f"Errore nell'aggiornamento delle credenziali: {e}")
-                    credentials = None
-            
-            # Se ancora non abbiamo credenziali valide, serve autenticazione da zero
-            if not credentials:
-                # Ottieni client secrets dalle variabili d'ambiente
-                client_id = os.getenv('YOUTUBE_CLIENT_ID')
-                client_secret = os.getenv('YOUTUBE_CLIENT_SECRET')
+                self.logger.info("Credenziali caricate dal file")
                 
-                if not client_id or not client_secret:
-                    self.logger.error(
-                        "Client ID o Secret YouTube non trovati nelle variabili d'ambiente"
-                    )
-                    return False
-                
-                # Crea dizionario di configurazione client
-                client_config = {
-                    "installed": {
-                        "client_id": client_id,
-                        "client_secret": client_secret,
-                        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                        "token_uri": "https://oauth2.googleapis.com/token",
-                        "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-                        "redirect_uris": ["http://localhost"]
-                    }
-                }
-                
-                # Esegui il flusso OAuth
-                self.logger.warning(
-                    "Nessuna credenziale YouTube valida trovata, avvio del processo di autenticazione"
+                # Se esiste un token nell'ambiente ed è diverso da quello nel file, usa quello dell'ambiente
+                if env_refresh_token and env_refresh_token != credentials.refresh_token:
+                    self.logger.info("Token di refresh nell'ambiente diverso dal file, uso quello dell'ambiente")
+                    credentials.refresh_token = env_refresh_token
+                elif credentials.expiry and (
+                    credentials.expiry - datetime.datetime.utcnow() > datetime.timedelta(minutes=5)
+                ):
+                    # Token salvato ancora valido: nessun refresh, flusso OAuth né salvataggio
+                    self.logger.info("Uso credenziali YouTube esistenti e valide")
+                    return credentials
+            except Exception as e:
+                self.logger.error(f"Errore nel caricamento delle credenziali: {e}")
+        
+        # Se non ci sono credenziali ma c'è un token di refresh nell'ambiente, crea le credenziali
+        if not credentials and env_refresh_token:
+            self.logger.info("Creazione credenziali dal token di refresh nell'ambiente")
+            client_id = os.getenv('YOUTUBE_CLIENT_ID')
+            client_secret = os.getenv('YOUTUBE_CLIENT_SECRET')
+            
+            if not client_id or not client_secret:
+                self.logger.error(
+                    "Client ID o Secret YouTube non trovati nelle variabili d'ambiente"
                 )
+                return None
                 
-                # Uso porta fissa 8080 per evitare problemi con redirect_uri dinamici
-                flow = InstalledAppFlow.from_client_config(
-                    client_config, self.SCOPES
-                )
-                credentials = flow.run_local_server(
-                    port=8080,
-                    prompt='consent',  # Force re-consent
-                    authorization_prompt_message="Per favore, completa l'autenticazione nel browser",
-                    success_message="Autenticazione completata! Puoi chiudere questa finestra."
+            credentials = Credentials(
+                None,  # Nessun access token
+                refresh_token=env_refresh_token,
+                token_uri="https://oauth2.googleapis.com/token",
+                client_id=client_id,
+                client_secret=client_secret,
+                scopes=self.SCOPES
+            )
+        
+        # Verifica se le credenziali sono valide
+        if credentials and credentials.valid:
+            self.logger.info("Uso credenziali YouTube esistenti e valide")
+        elif credentials and credentials.expired and credentials.refresh_token:
+            try:
+                # Refresh del token
+                self.logger.info("Aggiornamento credenziali YouTube scadute")
+                credentials.refresh(Request())
+                self.logger.info("Credenziali aggiornate con successo")
+            except Exception as e:
+                self.logger.error(f"Errore nell'aggiornamento delle credenziali: {e}")
+                credentials = None
+        
+        # Se ancora non abbiamo credenziali valide, serve autenticazione da zero
+        if not credentials:
+            # Ottieni client secrets dalle variabili d'ambiente
+            client_id = os.getenv('YOUTUBE_CLIENT_ID')
+            client_secret = os.getenv('YOUTUBE_CLIENT_SECRET')
+            
+            if not client_id or not client_secret:
+                self.logger.error(
+                    "Client ID o Secret YouTube non trovati nelle variabili d'ambiente"
                 )
-                self.logger.info("Autenticazione completata con successo")
+                return None
             
-            # Save credentials for next run
-            if credentials:
-                try:
-                    # Assicura che la directory esista
-                    self.credentials_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # Imposta permessi di sola lettura per l'utente corrente
-                    with open(self.credentials_path, 'w') as f:
-                        creds_dict = {
-                            'token': credentials.token,
-                            'refresh_token': credentials.refresh_token,
-                            'token_uri': credentials.token_uri,
-                            'client_id': credentials.client_id,
-                            'client_secret': credentials.client_secret,
-                            'scopes': credentials.scopes
-                        }
-                        json.dump(creds_dict, f)
-                    
-                    # Imposta permessi di sola lettura per l'utente corrente (solo su sistemi Unix)
-                    if os.name != 'nt':  # Non Windows
-                        os.chmod(self.credentials_path, 0o600)
-                        
-                    # Aggiorna la variabile d'ambiente YOUTUBE_REFRESH_TOKEN se è cambiata
-                    if os.getenv('YOUTUBE_REFRESH_TOKEN') != credentials.refresh_token:
-                        os.environ['YOUTUBE_REFRESH_TOKEN'] = credentials.refresh_token
-                        self.logger.info("Aggiornato token di refresh nelle variabili d'ambiente")
+            # Crea dizionario di configurazione client
+            client_config = {
+                "installed": {
+                    "client_id": client_id,
+                    "client_secret": client_secret,
+                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+                    "token_uri": "https://oauth2.googleapis.com/token",
+                    "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+                    "redirect_uris": ["http://localhost"]
+                }
+            }
+            
+            # Esegui il flusso OAuth
+            self.logger.warning(
+                "Nessuna credenziale YouTube valida trovata, avvio del processo di autenticazione"
+            )
+            
+            # Uso porta fissa 8080 per evitare problemi con redirect_uri dinamici
+            flow = InstalledAppFlow.from_client_config(
+                client_config, self.SCOPES
+            )
+            credentials = flow.run_local_server(
+                port=8080,
+                prompt='consent',  # Force re-consent
+                authorization_prompt_message="Per favore, completa l'autenticazione nel browser",
+                success_message="Autenticazione completata! Puoi chiudere questa finestra."
+            )
+            self.logger.info("Autenticazione completata con successo")
+        
+        # Save credentials for next run
+        if credentials:
+            try:
+                self._save_credentials(credentials)
                     
-                    self.logger.info(f"Credenziali salvate in {self.credentials_path}")
-                except Exception as e:
-                    self.logger.warning(f"Errore nel salvataggio delle credenziali su disco: {e}")
+                # Aggiorna la variabile d'ambiente YOUTUBE_REFRESH_TOKEN se è cambiata
+                if os.getenv('YOUTUBE_REFRESH_TOKEN') != credentials.refresh_token:
+                    os.environ['YOUTUBE_REFRESH_TOKEN'] = credentials.refresh_token
+                    self.logger.info("Aggiornato token di refresh nelle variabili d'ambiente")
                 
+                self.logger.info(f"Credenziali salvate in {self.credentials_path}")
+            except Exception as e:
+                self.logger.warning(f"Errore nel salvataggio delle credenziali su disco: {e}")
+        
+        return credentials
+    
+    def authenticate(self):
+        """
+        Authenticate with YouTube API using OAuth2.
+        Handles token refresh and initial setup.
+        
+        Returns:
+            bool: True if authentication successful
+        """
+        try:
+            # The credentials file lock is taken only around reading and writing it
+            credentials = self._obtain_credentials()
+            
+            if credentials:
                 # Costruisci il client API YouTube
-                self.youtube = build(
-                    self.API_SERVICE_NAME, 
-                    self.API_VERSION, 
-                    credentials=credentials
-                )
+                self._build_service(credentials)
                 
                 self.logger.info("Client API YouTube creato con successo")
+                
+                if self.config['upload'].get('prewarm', True):
+                    self._prewarm_upload_connection()
                 return True
             else:
                 self.logger.error("Impossibile ottenere credenziali YouTube")
@@ -217,9 +452,186 @@ class YouTubeUploader:
             self.logger.error(f"Errore di autenticazione: {e}")
             return False
     
+    def _prewarm_upload_connection(self):
+        """Open the TLS connection to the upload endpoint ahead of the first videos.insert."""
+        try:
+            # Same host videos.insert will use (httplib2 keeps one connection per host)
+            upload_url = self.youtube._rootDesc['rootUrl'] + self.UPLOAD_PATH
+            self._authed_http.request(upload_url, 'OPTIONS')
+            self.logger.debug("Connessione di upload pre-riscaldata")
+        except Exception as e:
+            self.logger.debug(f"Pre-warm della connessione di upload fallito: {e}")
+    
+    def _load_client_pool(self):
+        """
+        Load the optional pool of OAuth clients used to spread upload quota
+        across several Google Cloud projects.
+        
+        Reads comma-separated YOUTUBE_CLIENT_IDS, YOUTUBE_CLIENT_SECRETS and
+        YOUTUBE_REFRESH_TOKENS environment variables.
+        
+        Returns:
+            list: Pool entries with credentials and quota cooldown
+        """
+        client_ids = [v.strip() for v in os.getenv('YOUTUBE_CLIENT_IDS', '').split(',') if v.strip()]
+        client_secrets = [v.strip() for v in os.getenv('YOUTUBE_CLIENT_SECRETS', '').split(',') if v.strip()]
+        refresh_tokens = [v.strip() for v in os.getenv('YOUTUBE_REFRESH_TOKENS', '').split(',') if v.strip()]
+        
+        if not client_ids:
+            return []
+        
+        if not len(client_ids) == len(client_secrets) == len(refresh_tokens):
+            self.logger.warning(
+                "YOUTUBE_CLIENT_IDS, YOUTUBE_CLIENT_SECRETS e YOUTUBE_REFRESH_TOKENS "
+                "hanno lunghezze diverse, rotazione client disattivata"
+            )
+            return []
+        
+        pool = []
+        for client_id, client_secret, refresh_token in zip(client_ids, client_secrets, refresh_tokens):
+            pool.append({
+                'client_id': client_id,
+                'credentials': Credentials(
+                    None,  # Nessun access token
+                    refresh_token=refresh_token,
+                    token_uri="https://oauth2.googleapis.com/token",
+                    client_id=client_id,
+                    client_secret=client_secret,
+                    scopes=self.SCOPES
+                ),
+                'cooldown_until': 0
+            })
+        
+        self.logger.info(f"Rotazione upload su {len(pool)} client OAuth")
+        return pool
+    
+    def _select_upload_client(self):
+        """
+        Pick the API client for the next upload.
+        
+        Returns:
+            tuple: (youtube client, authorized http, pool entry or None);
+                   the client is None when every pooled client is cooling down
+        """
+        if not self._client_pool:
+            return self.youtube, self._get_authed_http(), None
+        
+        with self._pool_lock:
+            now = time.time()
+            for _ in range(len(self._client_pool)):
+                entry = next(self._next_client)
+                if entry['cooldown_until'] <= now:
+                    break
+            else:
+                return None, None, None
+        
+        # One client and connection per pool entry and thread (httplib2 is not thread-safe)
+        pool_clients = getattr(self._local, 'pool_clients', None)
+        if pool_clients is None:
+            pool_clients = self._local.pool_clients = {}
+        
+        client = pool_clients.get(entry['client_id'])
+        if client is None:
+            authed_http = AuthorizedHttp(entry['credentials'], http=httplib2.Http(cache=None, timeout=60))
+            youtube = build(
+                self.API_SERVICE_NAME,
+                self.API_VERSION,
+                http=authed_http,
+                static_discovery=True,
+                cache_discovery=False
+            )
+            client = pool_clients[entry['client_id']] = (youtube, authed_http)
+        
+        return client[0], client[1], entry
+    
+    def _execute_insert(self, youtube, http, body, video_file, mimetype, resumable, notify):
+        """
+        Run videos.insert with progress logging and retries.
+        
+        Args:
+            youtube: YouTube API client
+            http: Authorized HTTP connection for the calling thread
+            body (dict): Video resource body
+            video_file: Open binary file of the video
+            mimetype (str): Video MIME type
+            resumable (bool): Whether to use a resumable upload
+            notify (bool): Whether to notify channel subscribers
+            
+        Returns:
+            dict: API response, or None if the upload failed
+            
+        Raises:
+            HttpError: When the API quota is exhausted
+        """
+        # Insert video (resumable upload for large files)
+        media = MediaIoBaseUpload(
+            video_file, 
+            mimetype=mimetype, 
+            resumable=resumable,
+            chunksize=self.chunksize
+        )
+        
+        insert_request = youtube.videos().insert(
+            part='snippet,status',
+            body=body,
+            media_body=media,
+            notifySubscribers=notify
+        )
+        
+        # Upload with progress tracking (log only every 10% of the file)
+        response = None
+        milestone_step = max(media.size() // 10, 1)
+        next_milestone_bytes = milestone_step
+        log_progress = self.logger.logger.isEnabledFor(logging.INFO)
+        retry_count = 0
+        max_retries = 10
+        
+        while response is None:
+            try:
+                if not resumable:
+                    response = insert_request.execute(http=http)
+                    continue
+                
+                status, response = insert_request.next_chunk(http=http)
+                if status and status.resumable_progress >= next_milestone_bytes:
+                    if log_progress:
+                        self.logger.info(f"Upload progress: {int(status.progress() * 100)}%")
+                    while next_milestone_bytes <= status.resumable_progress:
+                        next_milestone_bytes += milestone_step
+            except HttpError as e:
+                if e.resp.status in self.RETRIABLE_STATUS_CODES and retry_count < max_retries:
+                    retry_count += 1
+                    sleep_time = self._retry_delay(retry_count, e.resp.get('retry-after'))
+                    self.logger.warning(
+                        f"YouTube API error {e.resp.status}, retrying in {sleep_time:.1f} seconds"
+                    )
+                    time.sleep(sleep_time)
+                elif "quotaExceeded" in str(e):
+                    raise
+                else:
+                    self.logger.error(f"Upload failed: {e}")
+                    return None
+            except (socket.timeout, ConnectionResetError) as e:
+                if retry_count < max_retries:
+                    retry_count += 1
+                    sleep_time = self._retry_delay(retry_count)
+                    self.logger.warning(
+                        f"Network error during upload ({e}), retrying in {sleep_time:.1f} seconds"
+                    )
+                    time.sleep(sleep_time)
+                else:
+                    self.logger.error(f"Upload failed: {e}")
+                    return None
+            except Exception as e:
+                self.logger.error(f"Upload error: {e}")
+                return None
+        
+        return response
+    
     def upload_video(self, video_path, title, description, tags=None, 
                    thumbnail_path=None, visibility='public', 
-                   category_id='22', source_video_data=None):  # 22 is 'People & Blogs'
+                   category_id='22', source_video_data=None,  # 22 is 'People & Blogs'
+                   notify=None):
         """
         Upload a video to YouTube.
         
@@ -232,18 +644,17 @@ class YouTubeUploader:
             visibility (str): Privacy status ('public', 'private', 'unlisted')
             category_id (str): YouTube video category ID
             source_video_data (dict, optional): Original video data for credits
+            notify (bool, optional): Notify channel subscribers; defaults to
+                upload.notify_subscribers (False)
             
         Returns:
             dict: Upload result with video ID and URL
         """
-        if not self.youtube:
+        if not self.youtube and not self._client_pool:
             if not self.authenticate():
                 self.logger.error("YouTube authentication failed, cannot upload")
                 return None
-        
-        if not os.path.exists(video_path):
-            self.logger.error(f"Video file not found: {video_path}")
-            return None
+        self._ensure_fresh_credentials()
         
         # Ensure tags is a list
         if tags is None:
@@ -257,36 +668,27 @@ class YouTubeUploader:
         # Add credits to description if source video data is provided
         final_description = description
         if source_video_data:
-            channel_title = source_video_data.get('channel_title')
-            
-            # If channel_title is None or empty, try to get it from metadata
-            if not channel_title:
-                metadata = source_video_data.get('metadata')
-                if isinstance(metadata, str):
-                    try:
-                        import json
-                        metadata_dict = json.loads(metadata)
-                        # YouTube API doesn't always provide channelTitle in metadata
-                        # Use a default fallback
-                        channel_title = "Creator originale"
-                    except:
-                        channel_title = "Creator originale"
+            # Parse source metadata once
+            metadata = source_video_data.get('metadata')
+            try:
+                if isinstance(metadata, dict):
+                    meta = metadata
+                elif isinstance(metadata, str):
+                    meta = _loads(metadata)
                 else:
-                    channel_title = "Creator originale"
-            
-            channel_id = None
+                    meta = {}
+            except ValueError:
+                meta = {}
+            if not isinstance(meta, dict):
+                meta = {}
             
-            # Extract channel_id from metadata if available
-            metadata = source_video_data.get('metadata')
-            if isinstance(metadata, dict):
-                channel_id = metadata.get('channel_id')
-            elif isinstance(metadata, str):
-                try:
-                    import json
-                    metadata_dict = json.loads(metadata)
-                    channel_id = metadata_dict.get('channel_id')
-                except:
-                    pass
+            # YouTube API doesn't always provide channelTitle in metadata, use a default fallback
+            channel_title = (
+                source_video_data.get('channel_title') or
+                meta.get('channelTitle') or
+                "Creator originale"
+            )
+            channel_id = meta.get('channel_id')
             
             # Add credits line
             if channel_id:
@@ -314,50 +716,47 @@ class YouTubeUploader:
         }
         
         # Execute upload
+        video_file = None
         try:
-            # Insert video with resumable upload
-            media = MediaFileUpload(
-                video_path, 
-                mimetype='video/*', 
-                resumable=True,
-                chunksize=1024*1024  # 1MB chunk size
-            )
+            # Large read buffer lets OS readahead span several chunks
+            try:
+                video_file = open(video_path, 'rb', buffering=8 * 1024 * 1024)
+            except FileNotFoundError:
+                self.logger.error(f"Video file not found: {video_path}")
+                return None
             
-            insert_request = self.youtube.videos().insert(
-                part='snippet,status',
-                body=body,
-                media_body=media,
-                notifySubscribers=True
-            )
+            # Files smaller than a chunk are sent in a single request
+            resumable = os.fstat(video_file.fileno()).st_size > self.chunksize
             
-            # Upload with progress tracking
-            response = None
-            last_progress = 0
-            retry_count = 0
-            max_retries = 10
+            mimetype = mimetypes.guess_type(video_path)[0] or 'video/mp4'
             
-            while response is None:
+            if notify is None:
+                notify = self.config['upload'].get('notify_subscribers', False)
+            
+            # Rotate across the OAuth client pool, skipping clients out of quota
+            while True:
+                youtube, http, pool_entry = self._select_upload_client()
+                if youtube is None:
+                    self.logger.error("All YouTube API clients have exhausted their quota")
+                    return None
+                
+                video_file.seek(0)
                 try:
-                    status, response = insert_request.next_chunk()
-                    if status:
-                        progress = int(status.progress() * 100)
-                        if progress - last_progress >= 10:
-                            self.logger.info(f"Upload progress: {progress}%")
-                            last_progress = progress
+                    response = self._execute_insert(
+                        youtube, http, body, video_file, mimetype, resumable, notify
+                    )
                 except HttpError as e:
-                    if e.resp.status in [500, 502, 503, 504] and retry_count < max_retries:
-                        retry_count += 1
-                        sleep_time = 2 ** retry_count
+                    if pool_entry is not None and "quotaExceeded" in str(e):
+                        pool_entry['cooldown_until'] = time.time() + 86400
                         self.logger.warning(
-                            f"YouTube API error {e.resp.status}, retrying in {sleep_time} seconds"
+                            f"Quota exceeded for client {pool_entry['client_id'][:12]}..., trying next client"
                         )
-                        time.sleep(sleep_time)
-                    else:
-                        self.logger.error(f"Upload failed: {e}")
-                        return None
-                except Exception as e:
-                    self.logger.error(f"Upload error: {e}")
-                    return None
+                        continue
+                    raise
+                break
+            
+            if response is None:
+                return None
             
             video_id = response['id']
             self.logger.info(f"Video uploaded successfully with ID: {video_id}")
@@ -365,10 +764,10 @@ class YouTubeUploader:
             # Upload thumbnail if provided
             if thumbnail_path and os.path.exists(thumbnail_path):
                 try:
-                    self.youtube.thumbnails().set(
+                    youtube.thumbnails().set(
                         videoId=video_id,
                         media_body=MediaFileUpload(thumbnail_path)
-                    ).execute()
+                    ).execute(http=http)
                     self.logger.info(f"Thumbnail uploaded for video {video_id}")
                 except Exception as e:
                     self.logger.warning(f"Failed to upload thumbnail: {e}")
@@ -394,6 +793,32 @@ class YouTubeUploader:
         except Exception as e:
             self.logger.error(f"Upload error: {e}")
             return None
+        finally:
+            if video_file is not None:
+                video_file.close()
+    
+    def _next_slot(self, now):
+        """
+        Return the first configured upload time after now.
+        
+        Args:
+            now (datetime): Reference time
+            
+        Returns:
+            datetime: Next slot today, or the first slot tomorrow; tomorrow
+                at 12:00 when no configured time could be parsed
+        """
+        if not self._upload_times:
+            return datetime.datetime.combine(
+                now.date() + datetime.timedelta(days=1), datetime.time(hour=12, minute=0)
+            )
+        
+        idx = bisect.bisect_right(self._upload_times, now.time())
+        if idx < len(self._upload_times):
+            return datetime.datetime.combine(now.date(), self._upload_times[idx])
+        return datetime.datetime.combine(
+            now.date() + datetime.timedelta(days=1), self._upload_times[0]
+        )
     
     def schedule_upload(self, clip_data, scheduled_time=None):
         """
@@ -416,22 +841,17 @@ class YouTubeUploader:
         source_video_data = None
         if 'source_id' in clip_data or 'source_video_id' in clip_data:
             try:
-                import sqlite3
-                conn = sqlite3.connect(self.config['paths']['database'])
-                cursor = conn.cursor()
-                
                 source_id = clip_data.get('source_id') or clip_data.get('source_video_id')
-                cursor.execute("SELECT * FROM source_videos WHERE id = ?", (source_id,))
-                source_row = cursor.fetchone()
+                source_row = self._db_fetchone(
+                    "SELECT channel, metadata FROM source_videos WHERE id = ?", (source_id,)
+                )
                 
                 if source_row:
                     source_video_data = {
-                        'channel_title': source_row[3],  # channel field
-                        'metadata': source_row[12]  # metadata JSON field
+                        'channel_title': source_row['channel'],
+                        'metadata': source_row['metadata']
                     }
-                    self.logger.info(f"Found source video data for credits: {source_row[3]}")
-                
-                conn.close()
+                    self.logger.info(f"Found source video data for credits: {source_row['channel']}")
             except Exception as e:
                 self.logger.warning(f"Could not retrieve source video data: {e}")
         
@@ -457,49 +877,11 @@ class YouTubeUploader:
         
         # Determine upload time if not specified
         if scheduled_time is None:
-            upload_times = self.config['upload']['upload_times']
-            
-            if not upload_times:
+            if not self.config['upload'].get('upload_times'):
                 # Default to current time + 5 minutes
                 scheduled_time = datetime.datetime.now() + datetime.timedelta(minutes=5)
             else:
-                # Choose the next available time
-                now = datetime.datetime.now()
-                today = now.date()
-                
-                # Parse upload times
-                today_times = []
-                for time_str in upload_times:
-                    try:
-                        hour, minute = map(int, time_str.split(':'))
-                        time_obj = datetime.datetime.combine(
-                            today, datetime.time(hour=hour, minute=minute)
-                        )
-                        today_times.append(time_obj)
-                    except Exception as e:
-                        self.logger.warning(f"Invalid upload time format: {time_str} - {e}")
-                
-                # Add tomorrow's times too
-                tomorrow = today + datetime.timedelta(days=1)
-                tomorrow_times = []
-                for time_obj in today_times:
-                    tomorrow_time = datetime.datetime.combine(
-                        tomorrow, time_obj.time()
-                    )
-                    tomorrow_times.append(tomorrow_time)
-                
-                all_times = sorted(today_times + tomorrow_times)
-                
-                # Find the next available time
-                future_times = [t for t in all_times if t > now]
-                
-                if future_times:
-                    scheduled_time = future_times[0]
-                else:
-                    # Default to tomorrow if no future times today
-                    scheduled_time = datetime.datetime.combine(
-                        tomorrow, datetime.time(hour=12, minute=0)
-                    )
+                scheduled_time = self._next_slot(datetime.datetime.now())
         
         # Determine whether to upload now or schedule
         now = datetime.datetime.now()
@@ -546,9 +928,12 @@ class YouTubeUploader:
             now = datetime.datetime.now()
             scheduled = db.execute_query(
                 """
-                SELECT * FROM uploaded_videos 
-                WHERE youtube_id IS NULL 
-                AND scheduled_time <= ?
+                SELECT uv.*, pc.file_path, sv.channel, sv.metadata
+                FROM uploaded_videos uv
+                JOIN processed_clips pc ON pc.id = uv.clip_id
+                LEFT JOIN source_videos sv ON sv.id = pc.source_id
+                WHERE uv.youtube_id IS NULL 
+                AND uv.scheduled_time <= ?
                 """,
                 (now.isoformat(),)
             )
@@ -558,62 +943,75 @@ class YouTubeUploader:
                 
             self.logger.info(f"Found {len(scheduled)} videos scheduled for upload")
             
-            uploaded_ids = []
+            # Authenticate once before fanning out to worker threads
+            if not self.youtube and not self._client_pool and not self.authenticate():
+                self.logger.error("YouTube authentication failed, cannot upload")
+                return []
             
-            # Process each scheduled upload
+            jobs = []
             for video in scheduled:
-                try:
-                    # Get clip information
-                    clip_id = video['clip_id']
-                    clip = db.execute_query(
-                        "SELECT * FROM processed_clips WHERE id = ?", 
-                        (clip_id,)
-                    )
-                    
-                    if not clip:
-                        self.logger.error(f"Clip not found for scheduled upload: {clip_id}")
-                        continue
-                    
-                    clip = clip[0]
-                    
-                    # Check if file exists
-                    file_path = clip['file_path']
-                    if not os.path.exists(file_path):
-                        self.logger.error(f"Video file not found: {file_path}")
-                        continue
-                    
-                    # Upload video
-                    upload_result = self.upload_video(
+                # Check if file exists
+                file_path = video['file_path']
+                if not file_path or not os.path.exists(file_path):
+                    self.logger.error(f"Video file not found: {file_path}")
+                    continue
+                
+                # Source video data for credits
+                source_video_data = None
+                if video['channel'] or video['metadata']:
+                    source_video_data = {
+                        'channel_title': video['channel'],
+                        'metadata': video['metadata']
+                    }
+                
+                jobs.append((video, file_path, source_video_data))
+            
+            uploaded_ids = []
+            max_workers = self.config['upload'].get('max_concurrent', 2)
+            
+            # Upload videos concurrently; database updates stay on this thread
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        self.upload_video,
                         file_path,
                         video['title'],
                         video['description'],
                         tags=video['hashtags'].split(',') if video['hashtags'] else [],
-                        visibility=video['visibility']
-                    )
-                    
-                    if upload_result:
-                        # Update database
-                        db.execute_query(
-                            """
-                            UPDATE uploaded_videos 
-                            SET youtube_id = ?, url = ?, upload_time = ? 
-                            WHERE id = ?
-                            """,
-                            (
-                                upload_result['youtube_id'],
-                                upload_result['url'],
-                                upload_result['upload_time'],
-                                video['id']
-                            )
-                        )
-                        
-                        self.logger.info(
-                            f"Successfully uploaded scheduled video: {upload_result['youtube_id']}"
-                        )
-                        uploaded_ids.append(video['id'])
+                        visibility=video['visibility'],
+                        source_video_data=source_video_data
+                    ): video
+                    for video, file_path, source_video_data in jobs
+                }
+                
+                for future in concurrent.futures.as_completed(futures):
+                    video = futures[future]
+                    try:
+                        upload_result = future.result()
                         
-                except Exception as e:
-                    self.logger.error(f"Error processing scheduled upload {video['id']}: {e}")
+                        if upload_result:
+                            # Update database
+                            db.execute_query(
+                                """
+                                UPDATE uploaded_videos 
+                                SET youtube_id = ?, url = ?, upload_time = ? 
+                                WHERE id = ?
+                                """,
+                                (
+                                    upload_result['youtube_id'],
+                                    upload_result['url'],
+                                    upload_result['upload_time'],
+                                    video['id']
+                                )
+                            )
+                            
+                            self.logger.info(
+                                f"Successfully uploaded scheduled video: {upload_result['youtube_id']}"
+                            )
+                            uploaded_ids.append(video['id'])
+                            
+                    except Exception as e:
+                        self.logger.error(f"Error processing scheduled upload {video['id']}: {e}")
             
             return uploaded_ids
             
@@ -631,55 +1029,80 @@ class YouTubeUploader:
         Returns:
             dict: Analytics data
         """
+        analytics = self.get_video_analytics_batch([youtube_id])
+        if not analytics:
+            return None
+        
+        return analytics.get(youtube_id)
+    
+    def get_video_analytics_batch(self, youtube_ids):
+        """
+        Get analytics for many YouTube videos, up to 50 per API call.
+        
+        Args:
+            youtube_ids (list): YouTube video IDs
+            
+        Returns:
+            dict: Analytics data keyed by YouTube video ID
+        """
         if not self.youtube:
             if not self.authenticate():
                 self.logger.error("YouTube authentication failed, cannot get analytics")
                 return None
+        self._ensure_fresh_credentials()
+        
+        results = {}
         
         try:
-            # Get video statistics
-            response = self.youtube.videos().list(
-                part='statistics',
-                id=youtube_id
-            ).execute()
-            
-            if not response.get('items'):
-                self.logger.warning(f"No statistics found for video {youtube_id}")
-                return None
+            for i in range(0, len(youtube_ids), 50):
+                batch_ids = youtube_ids[i:i + 50]
                 
-            stats = response['items'][0]['statistics']
-            
-            # Convert string values to integers
-            views = int(stats.get('viewCount', 0))
-            likes = int(stats.get('likeCount', 0))
-            comments = int(stats.get('commentCount', 0))
-            
-            # Calculate engagement rate
-            engagement_rate = 0
-            if views > 0:
-                engagement_rate = (likes + comments) / views * 100
-            
-            # Calculate viral score (simplified)
-            # This is a basic formula - for a real app, this would be much more sophisticated
-            viral_score = min(100, (
-                (views * 0.5) +
-                (likes * 2) +
-                (comments * 3)
-            ) / 100)
-            
-            # Return analytics data
-            analytics = {
-                'youtube_id': youtube_id,
-                'views': views,
-                'likes': likes,
-                'comments': comments,
-                'engagement_rate': engagement_rate,
-                'viral_score': viral_score,
-                'timestamp': datetime.datetime.now().isoformat()
-            }
+                # Get video statistics
+                response = self.youtube.videos().list(
+                    part='statistics',
+                    id=','.join(batch_ids),
+                    maxResults=50
+                ).execute(http=self._get_authed_http())
+                
+                timestamp = datetime.datetime.now().isoformat()
+                
+                for item in response.get('items', []):
+                    stats = item['statistics']
+                    
+                    # Convert string values to integers
+                    views = int(stats.get('viewCount', 0))
+                    likes = int(stats.get('likeCount', 0))
+                    comments = int(stats.get('commentCount', 0))
+                    
+                    # Calculate engagement rate
+                    engagement_rate = 0
+                    if views > 0:
+                        engagement_rate = (likes + comments) / views * 100
+                    
+                    # Calculate viral score (simplified)
+                    # This is a basic formula - for a real app, this would be much more sophisticated
+                    viral_score = min(100, (
+                        (views * 0.5) +
+                        (likes * 2) +
+                        (comments * 3)
+                    ) / 100)
+                    
+                    results[item['id']] = {
+                        'youtube_id': item['id'],
+                        'views': views,
+                        'likes': likes,
+                        'comments': comments,
+                        'engagement_rate': engagement_rate,
+                        'viral_score': viral_score,
+                        'timestamp': timestamp
+                    }
+                
+                for youtube_id in batch_ids:
+                    if youtube_id not in results:
+                        self.logger.warning(f"No statistics found for video {youtube_id}")
             
-            self.logger.info(f"Retrieved analytics for video {youtube_id}: {views} views")
-            return analytics
+            self.logger.info(f"Retrieved analytics for {len(results)}/{len(youtube_ids)} videos")
+            return results
             
         except HttpError as e:
             self.logger.error(f"YouTube API error getting analytics: {e}")
@@ -737,24 +1160,7 @@ class YouTubeUploader:
             # Save credentials for next run
             if credentials:
                 try:
-                    # Assicura che la directory esista
-                    self.credentials_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # Salva le credenziali in formato JSON
-                    with open(self.credentials_path, 'w') as f:
-                        creds_dict = {
-                            'token': credentials.token,
-                            'refresh_token': credentials.refresh_token,
-                            'token_uri': credentials.token_uri,
-                            'client_id': credentials.client_id,
-                            'client_secret': credentials.client_secret,
-                            'scopes': credentials.scopes
-                        }
-                        json.dump(creds_dict, f)
-                    
-                    # Imposta permessi di sola lettura per l'utente corrente (solo su sistemi Unix)
-                    if os.name != 'nt':  # Non Windows
-                        os.chmod(self.credentials_path, 0o600)
+                    self._save_credentials(credentials)
                     
                     # Salva il refresh token nella variabile d'ambiente
                     os.environ['YOUTUBE_REFRESH_TOKEN'] = credentials.refresh_token
@@ -765,13 +1171,12 @@ class YouTubeUploader:
                     self.logger.warning(f"Errore nel salvataggio delle credenziali: {e}")
                 
                 # Costruisci il client API YouTube
-                self.youtube = build(
-                    self.API_SERVICE_NAME, 
-                    self.API_VERSION, 
-                    credentials=credentials
-                )
+                self._build_service(credentials)
                 
                 self.logger.info("Client API YouTube creato con successo")
+                
+                if self.config['upload'].get('prewarm', True):
+                    self._prewarm_upload_connection()
                 return True
             else:
                 self.logger.error("Impossibile ottenere credenziali YouTube")
@@ -788,12 +1193,12 @@ class YouTubeUploader:
         Returns:
             str: The current refresh token or None if not available
         """
-        if self.credentials_path.exists():
-            try:
-                with open(self.credentials_path, 'r') as f:
-                    creds_data = json.load(f)
-                    return creds_data.get('refresh_token')
-            except Exception as e:
-                self.logger.error(f"Error loading credentials: {e}")
+        try:
+            # Re-parsed only when the file's mtime changes (shared with the startup diagnostics)
+            return load_json_cached(self.credentials_path).get('refresh_token')
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.error(f"Error loading credentials: {e}")
         
         return None
@@ -5,13 +5,195 @@ Provides standardized logging functionality across the application.
 
 import os
 import sys
+import atexit
 import logging
 import datetime
 import platform
 import traceback
-import importlib
+import functools
+import importlib.metadata
 import subprocess
-from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler, MemoryHandler
+
+try:
+    import orjson
+    
+    def _loads(data):
+        return orjson.loads(data)
+except ImportError:
+    import json
+    
+    def _loads(data):
+        return json.loads(data)
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Above this size configuration files are validated by streaming (when ijson is available)
+STREAM_VALIDATE_BYTES = 4 * 1024
+
+
+# Parsed JSON files shared across modules: absolute path -> (mtime_ns, data)
+_JSON_CACHE = {}
+
+
+def load_json_cached(path):
+    """
+    Parse a JSON file, reusing the previous result while its mtime is unchanged.
+    
+    Args:
+        path (str or Path): JSON file to load
+        
+    Returns:
+        The parsed JSON data (shared: do not mutate it)
+        
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid JSON
+    """
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime_ns
+    cached = _JSON_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with open(key, 'rb') as f:
+        data = _loads(f.read())
+    _JSON_CACHE[key] = (mtime, data)
+    return data
+
+
+REQUIRED_DIRS = [
+    'data',
+    'data/downloads',
+    'data/processed',
+    'data/uploads',
+    'data/reports',
+    'logs'
+]
+
+REQUIRED_PACKAGES = [
+    'PyQt5',
+    'apscheduler',
+    'python-dotenv',
+    'google-auth',
+    'google-auth-oauthlib',
+    'google-auth-httplib2',
+    'google-api-python-client',
+    'openai',
+    'moviepy',
+    'matplotlib',
+    'pandas'
+]
+
+REQUIRED_FILES = [
+    'config.json',
+    '.env',
+    'data/youtube_credentials.json'
+]
+
+ENV_VARS = (
+    'PYTHONPATH', 'PATH', 'OPENAI_API_KEY', 'GOOGLE_APPLICATION_CREDENTIALS',
+    'YOUTUBE_REFRESH_TOKEN'
+)
+
+# Environment variables whose value is truncated in the logs
+MASK_VARS = frozenset({'OPENAI_API_KEY', 'YOUTUBE_REFRESH_TOKEN'})
+
+
+def _scan_directories():
+    """Return (directory, existed, create_error) for each required directory, creating missing ones."""
+    results = []
+    listings = {}  # parent -> names of its subdirectories, one scandir per parent
+    for directory in REQUIRED_DIRS:
+        parent, name = os.path.split(directory)
+        parent = parent or '.'
+        if parent not in listings:
+            try:
+                with os.scandir(parent) as entries:
+                    listings[parent] = {e.name for e in entries if e.is_dir()}
+            except OSError:
+                listings[parent] = set()
+        
+        exists = name in listings[parent]
+        error = None
+        if not exists:
+            try:
+                Path(directory).mkdir(parents=True, exist_ok=True)
+            except Exception as e:
+                error = e
+        results.append((directory, exists, error))
+    return results
+
+
+def _normalize_dist_name(name):
+    """Normalize a distribution name for lookups (PEP 503 style)."""
+    return name.lower().replace('_', '-').replace('.', '-')
+
+
+def _scan_packages():
+    """Return (package, version) for each required package; version is None when missing."""
+    # One pass over the installed metadata: no package is imported
+    installed = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name:
+            installed.setdefault(_normalize_dist_name(name), dist.version)
+    
+    return [
+        (package, installed.get(_normalize_dist_name(package)))
+        for package in REQUIRED_PACKAGES
+    ]
+
+
+def _scan_configuration_files():
+    """Return (file, exists, json_error) for each required configuration file."""
+    results = []
+    for file in REQUIRED_FILES:
+        try:
+            size = os.stat(file).st_size
+            exists = True
+        except OSError:
+            exists = False
+        error = None
+        if exists and file.endswith('.json'):
+            try:
+                if ijson is not None and size > STREAM_VALIDATE_BYTES:
+                    # Large file: check it parses without building the object tree
+                    with open(file, 'rb') as f:
+                        for _ in ijson.parse(f):
+                            pass
+                else:
+                    # Cached: later readers of the same file (e.g. the uploader) reuse the parse
+                    load_json_cached(file)
+            except Exception as e:
+                error = e
+        results.append((file, exists, error))
+    return results
+
+
+@functools.lru_cache(maxsize=1)
+def _diagnostics_once():
+    """Collect system diagnostics once per process; every Logger shares the result."""
+    # The scans are independent and I/O-bound: overlap them, log afterwards in order
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        directories = executor.submit(_scan_directories)
+        packages = executor.submit(_scan_packages)
+        config_files = executor.submit(_scan_configuration_files)
+        
+        return {
+            'platform': platform.platform(),
+            'python_version': sys.version,
+            'cwd': os.getcwd(),
+            'directories': directories.result(),
+            'packages': packages.result(),
+            'config_files': config_files.result()
+        }
+
 
 class Logger:
     """
@@ -43,8 +225,7 @@ class Logger:
         self.log_dir = log_dir
         
         # Create log directory if it doesn't exist
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
+        Path(log_dir).mkdir(parents=True, exist_ok=True)
             
         # Generate log filename with current date
         today = datetime.datetime.now().strftime('%Y-%m-%d')
@@ -55,27 +236,42 @@ class Logger:
             log_file, maxBytes=10*1024*1024, backupCount=5
         )
         file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
+        
+        # One formatter shared by both handlers; no milliseconds in asctime
+        formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
-        file_handler.setFormatter(file_formatter)
+        formatter.default_msec_format = None
+        file_handler.setFormatter(formatter)
+        
+        # Buffer file writes: flushed every 512 records, on ERROR+ and at exit
+        buffered_handler = MemoryHandler(
+            capacity=512, flushLevel=logging.ERROR,
+            target=file_handler, flushOnClose=True
+        )
+        atexit.register(buffered_handler.flush)
         
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.DEBUG)
-        console_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(console_formatter)
+        console_handler.setFormatter(formatter)
         
         # Add handlers to logger
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(buffered_handler)
         self.logger.addHandler(console_handler)
         
         self.callbacks = []
         
-        # Run system diagnostics on initialization
-        self.run_system_diagnostics()
+        # Resolved once: the logging method and color prefix for each level
+        self._log_methods = {
+            'debug': self.logger.debug,
+            'info': self.logger.info,
+            'warning': self.logger.warning,
+            'error': self.logger.error,
+            'critical': self.logger.critical
+        }
+        self._prefix = {k.lower(): v for k, v in self.COLORS.items() if k != 'RESET'}
+        self._reset = self.COLORS['RESET']
     
     def add_callback(self, callback):
         """
@@ -87,179 +283,194 @@ class Logger:
         """
         self.callbacks.append(callback)
         
-    def _log_with_color(self, level, message):
+    def _log_with_color(self, level, message, *args):
         """
         Log a message with the specified level and call all callbacks.
         
         Args:
             level (str): Log level (INFO, WARNING, etc.)
-            message (str): The message to log
+            message (str): The message to log, optionally with %-style placeholders
+            *args: Arguments for the placeholders (formatted only if the record is emitted)
         """
         # Standard logging
-        log_method = getattr(self.logger, level.lower())
-        log_method(message)
+        self._log_methods[level](message, *args)
+        
+        if not self.callbacks:
+            return
         
         # Call all callbacks with colored message
-        colored_msg = f"{self.COLORS.get(level.upper(), '')}{message}{self.COLORS['RESET']}"
+        if args:
+            message = message % args
+        colored_msg = self._prefix.get(level, '') + message + self._reset
         for callback in self.callbacks:
             try:
                 callback(level, colored_msg)
             except Exception as e:
                 self.logger.error(f"Error in log callback: {e}")
     
-    def info(self, message):
+    def info(self, message, *args):
         """Log an info level message."""
-        self._log_with_color('info', message)
+        self._log_with_color('info', message, *args)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log a warning level message."""
-        self._log_with_color('warning', message)
+        self._log_with_color('warning', message, *args)
     
-    def error(self, message):
+    def error(self, message, *args):
         """Log an error level message."""
-        self._log_with_color('error', message)
+        self._log_with_color('error', message, *args)
     
-    def critical(self, message):
+    def critical(self, message, *args):
         """Log a critical level message."""
-        self._log_with_color('critical', message)
+        self._log_with_color('critical', message, *args)
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """Log a debug level message."""
-        self._log_with_color('debug', message)
+        self._log_with_color('debug', message, *args)
         
     def exception(self, message):
         """Log an exception with traceback."""
+        if not self.callbacks:
+            # Let the handlers format the traceback; no string building needed here
+            self.logger.error(message, exc_info=True)
+            return
+        
         tb = traceback.format_exc()
         self._log_with_color('error', f"{message}\n{tb}")
         
     def run_system_diagnostics(self):
-        """Run system diagnostics and log system information."""
+        """Run system diagnostics (once per process) and log system information."""
+        # Diagnostics only produce DEBUG output: skip the probing entirely otherwise
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        debug = self._log_methods['debug']
+        
         try:
-            self.debug("=== SYSTEM DIAGNOSTICS ===")
+            diagnostics = _diagnostics_once()
             
-            # System information
-            self.debug(f"Platform: {platform.platform()}")
-            self.debug(f"Python Version: {sys.version}")
-            
-            # Current working directory and file structure
-            self.debug(f"Current Working Directory: {os.getcwd()}")
+            # System information, working directory and file structure (one record)
+            debug("\n".join([
+                "=== SYSTEM DIAGNOSTICS ===",
+                f"Platform: {diagnostics['platform']}",
+                f"Python Version: {diagnostics['python_version']}",
+                f"Current Working Directory: {diagnostics['cwd']}"
+            ]))
             
             # Check important directories
-            self._check_directory_structure()
+            self._check_directory_structure(diagnostics['directories'])
             
             # Check Python packages
-            self._check_required_packages()
+            self._check_required_packages(diagnostics['packages'])
             
             # Check configuration files
-            self._check_configuration_files()
+            self._check_configuration_files(diagnostics['config_files'])
             
-            self.debug("=== DIAGNOSTICS COMPLETE ===")
+            debug("=== DIAGNOSTICS COMPLETE ===")
         except Exception as e:
             self.error(f"Error running diagnostics: {e}")
             self.exception("Diagnostics failed")
             
-    def _check_directory_structure(self):
-        """Check if required directories exist and log their status."""
-        required_dirs = [
-            'data',
-            'data/downloads',
-            'data/processed',
-            'data/uploads',
-            'data/reports',
-            'logs'
-        ]
+    def _check_directory_structure(self, results):
+        """Log the status of the required directories."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         
-        self.debug("Checking directory structure:")
-        for directory in required_dirs:
-            exists = os.path.exists(directory)
+        lines = ["Checking directory structure:"]
+        warnings = []
+        for directory, exists, error in results:
             status = "EXISTS" if exists else "MISSING"
-            self.debug(f"  - {directory}: {status}")
+            lines.append(f"  - {directory}: {status}")
             
             if not exists:
-                # Try to create the directory
-                try:
-                    os.makedirs(directory, exist_ok=True)
-                    self.debug(f"    Created directory: {directory}")
-                except Exception as e:
-                    self.warning(f"    Failed to create directory {directory}: {e}")
+                if error is None:
+                    lines.append(f"    Created directory: {directory}")
+                else:
+                    warnings.append(f"    Failed to create directory {directory}: {error}")
+        self._log_methods['debug']("\n".join(lines))
+        if warnings:
+            self.warning("\n".join(warnings))
                     
-    def _check_required_packages(self):
-        """Check for required Python packages and log their status."""
-        required_packages = [
-            'PyQt5',
-            'apscheduler',
-            'python-dotenv',
-            'google-auth',
-            'google-auth-oauthlib',
-            'google-auth-httplib2',
-            'google-api-python-client',
-            'openai',
-            'moviepy',
-            'matplotlib',
-            'pandas'
-        ]
+    def _check_required_packages(self, results):
+        """Log the status of the required Python packages."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         
-        self.debug("Checking required Python packages:")
-        for package in required_packages:
-            try:
-                pkg = importlib.import_module(package.split('[')[0])  # Handle cases like 'package[extra]'
-                version = getattr(pkg, '__version__', 'Unknown version')
-                self.debug(f"  - {package}: INSTALLED (version: {version})")
-            except ImportError:
-                self.warning(f"  - {package}: NOT INSTALLED")
+        lines = ["Checking required Python packages:"]
+        warnings = []
+        for package, version in results:
+            if version is not None:
+                lines.append(f"  - {package}: INSTALLED (version: {version})")
+            else:
+                warnings.append(f"  - {package}: NOT INSTALLED")
+        self._log_methods['debug']("\n".join(lines))
+        if warnings:
+            self.warning("\n".join(warnings))
                 
-    def _check_configuration_files(self):
-        """Check for required configuration files and log their status."""
-        required_files = [
-            'config.json',
-            '.env',
-            'data/youtube_credentials.json'
-        ]
+    def _check_configuration_files(self, results):
+        """Log the status of the required configuration files."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         
-        self.debug("Checking configuration files:")
-        for file in required_files:
-            exists = os.path.exists(file)
+        lines = ["Checking configuration files:"]
+        warnings = []
+        for file, exists, error in results:
             status = "EXISTS" if exists else "MISSING"
-            self.debug(f"  - {file}: {status}")
+            lines.append(f"  - {file}: {status}")
             
             if exists and file.endswith('.json'):
-                # Check if it's valid JSON
-                try:
-                    import json
-                    with open(file, 'r') as f:
-                        json.load(f)
-                    self.debug(f"    Valid JSON format")
-                except Exception as e:
-                    self.warning(f"    Invalid JSON format: {e}")
+                if error is None:
+                    lines.append("    Valid JSON format")
+                else:
+                    warnings.append(f"  - {file}: Invalid JSON format: {error}")
+        self._log_methods['debug']("\n".join(lines))
+        if warnings:
+            self.warning("\n".join(warnings))
                     
     def log_system_info(self):
         """Log detailed system information for troubleshooting."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        debug = self._log_methods['debug']
+        
         try:
-            self.debug("=== DETAILED SYSTEM INFORMATION ===")
-            
-            # Python paths
-            self.debug(f"PYTHONPATH: {sys.path}")
-            
-            # Environment variables relevant to the app
-            self.debug("Environment Variables:")
-            for var in ['PYTHONPATH', 'PATH', 'OPENAI_API_KEY', 'GOOGLE_APPLICATION_CREDENTIALS']:
-                value = os.environ.get(var, 'Not set')
+            lines = [
+                "=== DETAILED SYSTEM INFORMATION ===",
+                # Python paths (count plus the first entries)
+                f"PYTHONPATH: {len(sys.path)} entries, first: {sys.path[:5]}",
+                # Environment variables relevant to the app
+                "Environment Variables:"
+            ]
+            for var in ENV_VARS:
+                value = os.environ.get(var)
+                if value is None:
+                    lines.append(f"  - {var}: Not set")
+                    continue
                 # Mask sensitive information
-                if var in ['OPENAI_API_KEY']:
-                    value = f"{value[:6]}..." if value != 'Not set' else value
-                self.debug(f"  - {var}: {value}")
+                if var in MASK_VARS:
+                    value = f"{value[:6]}..."
+                lines.append(f"  - {var}: {value}")
+            debug("\n".join(lines))
                 
             # Database status
             self._check_database_status()
                 
-            self.debug("=== END SYSTEM INFORMATION ===")
+            debug("=== END SYSTEM INFORMATION ===")
         except Exception as e:
             self.error(f"Error logging system info: {e}")
             
-    def _check_database_status(self):
-        """Check the status of the SQLite database."""
+    def _check_database_status(self, list_tables=False):
+        """
+        Check the status of the SQLite database.
+        
+        Args:
+            list_tables (bool): Also log the list of tables
+        """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        debug = self._log_methods['debug']
+        
         db_path = 'data/viral_shorts.db'
-        self.debug(f"Checking database: {db_path}")
+        debug("Checking database: %s", db_path)
         
         if not os.path.exists(db_path):
             self.warning(f"Database file doesn't exist: {db_path}")
@@ -267,16 +478,18 @@ class Logger:
             
         try:
             import sqlite3
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Get list of tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = cursor.fetchall()
-            self.debug(f"Database tables: {[t[0] for t in tables]}")
-            
-            conn.close()
-            self.debug("Database connection successful")
+            # Read-only probe; not immutable, the app writes to this database in WAL mode
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+                debug("Database schema version: %s", schema_version)
+                
+                if list_tables:
+                    tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
+                    debug("Database tables: %s", [t[0] for t in tables])
+            finally:
+                conn.close()
+            debug("Database connection successful")
         except Exception as e:
             self.error(f"Database check error: {e}")
             self.exception("Database check failed")
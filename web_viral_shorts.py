@@ -1,40 +1,161 @@
-from flask import Flask, render_template_string, request, redirect, url_for, jsonify
+from flask import (
+    Flask, Response, request, redirect, url_for, jsonify, make_response, stream_with_context
+)
 import os
-import sys
+import re
+import bisect
+import hashlib
 import json
-import datetime
+import copy
+import functools
+import itertools
+import uuid
+import queue
+import atexit
+import time
 import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
-
-# Configura logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join('logs', 'app.log')),
-        logging.StreamHandler()
-    ]
-)
-
-logger = logging.getLogger('ViralShortsAI')
+from jinja2 import DictLoader, FileSystemBytecodeCache
 
 # Crea directory necessarie
 for directory in ['data/downloads', 'data/processed', 'logs']:
     os.makedirs(directory, exist_ok=True)
 
+# Configura logging: i thread delle richieste accodano soltanto,
+# un thread dedicato scrive su file e console
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler(os.path.join('logs', 'app.log')),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+# Il logger 'ViralShortsAI' di utils ha già una sua console: qui solo su file, senza doppioni
+_log_handlers[1].addFilter(lambda record: not record.name.startswith('ViralShortsAI'))
+
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_root_logger.addHandler(QueueHandler(_log_queue))
+
+# Nome proprio: 'ViralShortsAI' è configurato da utils.Logger con handler sincroni
+logger = logging.getLogger('ViralShortsWeb')
+
 # Carica variabili d'ambiente
 load_dotenv()
 
+# JSON: orjson se disponibile, altrimenti la libreria standard
+try:
+    import orjson
+    
+    def _loads(data):
+        return orjson.loads(data)
+    
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+    
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+# Moduli pesanti del pipeline (torch, ffmpeg, openai): importati da _preload_heavy,
+# in background all'avvio, così la prima richiesta di test non attende l'import
+Database = YouTubeShortsFinder = WhisperTranscriber = None
+GPTCaptioner = VideoEditor = PerformanceAnalyzer = None
+_heavy_lock = threading.Lock()
+
+def _preload_heavy():
+    """Importa i moduli pesanti del pipeline una sola volta (idempotente)"""
+    global Database, YouTubeShortsFinder, WhisperTranscriber
+    global GPTCaptioner, VideoEditor, PerformanceAnalyzer
+    
+    with _heavy_lock:
+        if PerformanceAnalyzer is not None:
+            return
+        from database import Database
+        from data.downloader import YouTubeShortsFinder
+        from ai.whisper_transcriber import WhisperTranscriber
+        from ai.gpt_captioner import GPTCaptioner
+        from processing.editor import VideoEditor
+        from monitoring.analyzer import PerformanceAnalyzer
+
 # Inizializza Flask
 app = Flask(__name__)
 
+# Bytecode dei template persistito tra i riavvii (directory temporanea di sistema)
+# e nessun controllo della sorgente a ogni render
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+app.jinja_env.auto_reload = False
+
+# Compressione gzip delle risposte, se flask-compress è installato
+try:
+    from flask_compress import Compress
+    Compress(app)
+except ImportError:
+    pass
+
 # Variabili globali
 config = {}
-process_running = False
-search_results = []
-process_status = "In attesa"
-process_progress = 0
+
+@dataclass(slots=True)
+class VideoResult:
+    """Video trovato dalla ricerca (slots: accesso agli attributi senza dict)"""
+    id: str
+    title: str
+    view_count: int
+    status: str
+
+# Risultati tenuti in memoria al massimo
+MAX_RESULTS = 200
+
+@dataclass(frozen=True)
+class State:
+    """Stato del processo in background; immutabile, quindi leggibile senza lock"""
+    running: bool = False
+    status: str = "In attesa"
+    progress: int = 0
+    results: tuple = ()
+    # Statistiche calcolate una volta quando cambiano i risultati
+    videos_today: int = 0
+    viral_count: int = 0
+    # Incrementata a ogni sostituzione: base dell'ETag della dashboard
+    version: int = 0
+
+# Gli scrittori sostituiscono lo snapshot sotto _state_lock; i lettori fanno solo snap = _state
+_state = State()
+_state_lock = threading.Lock()
+
+def _update_state(**changes):
+    """Sostituisce atomicamente lo snapshot dello stato con i campi indicati"""
+    global _state
+    with _state_lock:
+        _state = replace(_state, version=_state.version + 1, **changes)
+
+_stop_event = threading.Event()  # impostato da /stop_process per interrompere il worker
+
+# ID video da URL youtube.com/watch?v=... o youtu.be/...
+_YT_ID_RE = re.compile(r'(?:youtube\.com/watch\?v=|youtu\.be/)([^&\n?#]+)')
+
+# Worker riutilizzabili per i processi in background; _future è l'ultimo avviato
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vs-worker")
+_future = None
+
+# I test di /force_download durano minuti: pool separato, così non ritardano la ricerca
+_test_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vs-test")
+_test_jobs = {}  # job_id -> Future dei test avviati da /force_download
+_test_jobs_lock = threading.Lock()
+MAX_TEST_JOBS = 20  # oltre questo numero i job conclusi più vecchi vengono dimenticati
 
 # HTML Template
 HTML_TEMPLATE = """
@@ -197,11 +318,11 @@ HTML_TEMPLATE = """
 
             <div class="card">
                 <h3>Stato</h3>
-                <p><strong>Processo:</strong> {{ process_status }}</p>
+                <p><strong>Processo:</strong> <span id="process-status">{{ process_status }}</span></p>
                 <div style="width: 100%; background-color: #f1f1f1; border-radius: 4px;">
-                    <div style="height: 20px; width: {{ process_progress }}%; background-color: #4CAF50; border-radius: 4px;"></div>
+                    <div id="progress-bar" style="height: 20px; width: {{ process_progress }}%; background-color: #4CAF50; border-radius: 4px;"></div>
                 </div>
-                <p style="text-align: right;">{{ process_progress }}%</p>
+                <p style="text-align: right;"><span id="progress-text">{{ process_progress }}</span>%</p>
             </div>
 
             {% if message %}
@@ -315,9 +436,7 @@ HTML_TEMPLATE = """
 
             <div class="card">
                 <h3>Log</h3>
-                <div style="height: 200px; overflow-y: auto; background-color: #f5f5f5; padding: 10px; font-family: monospace;">
-                    {{ log_content }}
-                </div>
+                <div id="log" style="height: 200px; overflow-y: auto; background-color: #f5f5f5; padding: 10px; font-family: monospace; white-space: pre-wrap;">{{ log_content }}</div>
             </div>
         </div>
     </div>
@@ -336,19 +455,58 @@ HTML_TEMPLATE = """
         document.getElementById(tabName).style.display = "block";
         evt.currentTarget.className += " active";
     }
+
+    // Nuove righe di log in streaming (SSE), senza ricaricare la pagina
+    var logDiv = document.getElementById("log");
+    new EventSource("/log_stream").onmessage = function(e) {
+        logDiv.insertAdjacentText("beforeend", e.data + "\n");
+        logDiv.scrollTop = logDiv.scrollHeight;
+    };
+
+    // Stato del processo da /status mentre è in esecuzione, senza ricaricare la pagina
+    {% if process_running %}
+    var statusTimer = setInterval(function() {
+        fetch("/status").then(function(r) { return r.json(); }).then(function(s) {
+            document.getElementById("process-status").textContent = s.status;
+            document.getElementById("progress-bar").style.width = s.progress + "%";
+            document.getElementById("progress-text").textContent = s.progress;
+            if (!s.running) {
+                clearInterval(statusTimer);
+                window.location.reload();  // risultati e statistiche aggiornati
+            }
+        });
+    }, 1000);
+    {% endif %}
     </script>
 </body>
 </html>
 """
 
+# Template compilato una sola volta all'avvio (niente hash/lookup della sorgente per richiesta).
+# Caricato tramite loader e non from_string, così passa dal bytecode cache
+_TEMPLATE = app.jinja_env.overlay(
+    loader=DictLoader({"dashboard.html": HTML_TEMPLATE})
+).get_template("dashboard.html")
+
 # Funzioni di utilità
+@functools.lru_cache(maxsize=1)
+def _load_config_cached(mtime_ns):
+    """Legge e interpreta config.json (una volta per ogni mtime)"""
+    with open("config.json", "rb") as f:
+        return _loads(f.read())
+
 def load_config():
     """Carica la configurazione da file o crea default"""
-    if os.path.exists("config.json"):
+    try:
+        mtime_ns = os.stat("config.json").st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    
+    if mtime_ns is not None:
         try:
-            with open("config.json", "r") as f:
-                return json.load(f)
-        except json.JSONDecodeError:
+            # Copia: i componenti (es. PerformanceAnalyzer) modificano la config ricevuta
+            return copy.deepcopy(_load_config_cached(mtime_ns))
+        except ValueError:
             logger.error("Errore nel parsing di config.json")
     
     # Configurazione predefinita
@@ -364,130 +522,233 @@ def save_config(new_config):
     """Salva la configurazione su file"""
     with open("config.json", "w") as f:
         json.dump(new_config, f, indent=4)
+    _load_config_cached.cache_clear()
+
+# Ultimo contenuto letto del log, valido finché (mtime, dimensione) non cambiano
+_log_cache = {"key": None, "data": ""}
+LOG_TAIL_BYTES = 64 * 1024
+LOG_STREAM_POLL = 0.5  # secondi tra due controlli del log per /log_stream
+# Durata massima di una connessione /log_stream: poi si chiude e EventSource si
+# riconnette dopo LOG_STREAM_RETRY_MS, così un tab chiuso non tiene un thread a lungo
+LOG_STREAM_MAX_AGE = 120
+LOG_STREAM_RETRY_MS = 3000
 
 def read_log():
-    """Legge il file di log"""
+    """Legge la coda (ultimi 64 KB) del file di log"""
     log_path = os.path.join("logs", "app.log")
-    if os.path.exists(log_path):
-        try:
-            with open(log_path, "r") as f:
-                return f.read()
-        except:
-            return "Errore nella lettura del log"
-    return "Nessun log disponibile"
+    try:
+        st = os.stat(log_path)
+    except OSError:
+        return "Nessun log disponibile"
+    
+    key = (st.st_mtime_ns, st.st_size)
+    if key == _log_cache["key"]:
+        return _log_cache["data"]
+    
+    try:
+        with open(log_path, "rb") as f:
+            offset = max(0, st.st_size - LOG_TAIL_BYTES)
+            f.seek(offset)
+            data = f.read()
+        if offset:
+            # Scarta la prima riga, probabilmente troncata
+            data = data.partition(b"\n")[2]
+        data = data.decode("utf-8", errors="replace")
+    except OSError:
+        return "Errore nella lettura del log"
+    
+    _log_cache["key"] = key
+    _log_cache["data"] = data
+    return data
 
 def mock_search_videos():
-    """Simula la ricerca di video virali"""
+    """Simula la ricerca di video virali (generatore: chi consuma decide quanti risultati tenere)"""
     import random
-    import time
-    
-    global process_status, process_progress
     
-    videos = []
     total_steps = 5
     
-    # Simula progresso
+    # Simula progresso (si interrompe subito se viene richiesto lo stop)
     for step in range(1, total_steps + 1):
-        process_status = f"Passo {step}/{total_steps}: Ricerca video virali..."
-        process_progress = int((step / total_steps) * 100)
-        time.sleep(1)
+        _update_state(
+            status=f"Passo {step}/{total_steps}: Ricerca video virali...",
+            progress=int((step / total_steps) * 100)
+        )
+        if _stop_event.wait(1.0):
+            return
     
     # Genera risultati casuali
     for i in range(10):
-        video = {
-            "id": f"vid_{random.randint(10000, 99999)}",
-            "title": f"Video virale #{i+1}",
-            "view_count": random.randint(50000, 10000000),
-            "status": "Trovato"
-        }
-        videos.append(video)
-        time.sleep(0.2)
-    
-    process_status = "Completato"
-    return videos
+        video = VideoResult(
+            id=f"vid_{random.randint(10000, 99999)}",
+            title=f"Video virale #{i+1}",
+            view_count=random.randint(50000, 10000000),
+            status="Trovato"
+        )
+        yield video
+        if _stop_event.wait(0.2):
+            return
 
 def process_task():
     """Funzione che esegue il processo di ricerca in background"""
-    global process_running, search_results, process_status, process_progress
-    
     try:
-        process_running = True
+        # Stop arrivato mentre il task era ancora in coda
+        if _stop_event.is_set():
+            return
         
-        # Ricerca video virali (simulata)
-        search_results = mock_search_videos()
+        # Ricerca video virali (simulata): i primi MAX_RESULTS, la ricerca non prosegue oltre
+        results = tuple(itertools.islice(mock_search_videos(), MAX_RESULTS))
         
-        # Aggiorna stato
-        logger.info(f"Trovati {len(search_results)} video virali")
+        # Aggiorna stato (statistiche comprese: la dashboard non riscansiona i risultati)
+        viral = sum(1 for v in results if v.view_count > 100_000)
+        changes = dict(results=results, videos_today=len(results), viral_count=viral)
+        if not _stop_event.is_set():
+            changes["status"] = "Completato"
+        _update_state(**changes)
+        logger.info(f"Trovati {len(results)} video virali")
         
     except Exception as e:
         logger.error(f"Errore nel processo: {e}")
-        process_status = f"Errore: {e}"
+        _update_state(status=f"Errore: {e}")
     finally:
-        process_running = False
+        _update_state(running=False)
 
 # Rotte Flask
+# Categorie e durate disponibili
+CATEGORIES = ["gaming", "comedy", "music", "howto", "technology", "sports", "education"]
+DURATIONS = [15, 30, 60]
+
+def _dashboard_stats(snap):
+    """Statistiche della dashboard a partire da uno snapshot dello stato"""
+    return {
+        "videos_today": snap.videos_today,
+        "uploads": 0,
+        "viral": snap.viral_count
+    }
+
 @app.route('/')
 def index():
-    global config, search_results
+    global config
+    
+    snap = _state  # snapshot coerente per tutto il render
     
     # Carica la configurazione
     if not config:
         config = load_config()
     
-    # Statistiche
-    stats = {
-        "videos_today": len(search_results),
-        "uploads": 0,
-        "viral": len([v for v in search_results if v.get("view_count", 0) > 100000])
-    }
-    
-    # Categorie e durate disponibili
-    categories = ["gaming", "comedy", "music", "howto", "technology", "sports", "education"]
-    durations = [15, 30, 60]
+    # ETag da versione dello stato, config.json e messaggio; non dal log, che
+    # cambia di continuo e arriva comunque in tempo reale da /log_stream
+    try:
+        config_mtime = os.stat("config.json").st_mtime_ns
+    except OSError:
+        config_mtime = 0
+    etag = hashlib.blake2b(
+        f"{snap.version}:{config_mtime}:{request.query_string.decode()}".encode(),
+        digest_size=8
+    ).hexdigest()
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={"ETag": f'"{etag}"'})
     
     # Leggi il log
     log_content = read_log()
     
-    return render_template_string(
-        HTML_TEMPLATE,
+    # Stato reale del worker: un'eccezione sfuggita a process_task resta nel Future
+    status = snap.status
+    if _future is not None and _future.done() and _future.exception() is not None:
+        status = f"Errore: {_future.exception()}"
+    
+    rendered = _TEMPLATE.render(
         config=config,
-        stats=stats,
-        process_running=process_running,
-        process_status=process_status,
-        process_progress=process_progress,
-        search_results=search_results,
-        categories=categories,
-        durations=durations,
+        stats=_dashboard_stats(snap),
+        process_running=snap.running,
+        process_status=status,
+        process_progress=snap.progress,
+        search_results=snap.results,
+        categories=CATEGORIES,
+        durations=DURATIONS,
         log_content=log_content,
         message=request.args.get('message'),
         error=request.args.get('error')
     )
+    
+    response = make_response(rendered)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, max-age=2"
+    return response
+
+@app.route('/log_stream')
+def log_stream():
+    """Invia le nuove righe di logs/app.log come Server-Sent Events (tail -f)"""
+    log_path = os.path.join("logs", "app.log")
+    
+    # In riconnessione EventSource rimanda l'ultimo id (offset nel file): si riparte da lì
+    try:
+        resume_at = int(request.headers.get("Last-Event-ID", ""))
+    except ValueError:
+        resume_at = None
+    
+    def generate():
+        deadline = time.monotonic() + LOG_STREAM_MAX_AGE
+        with open(log_path, "rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            if resume_at is not None and 0 <= resume_at <= end:
+                f.seek(resume_at)
+            yield f"retry: {LOG_STREAM_RETRY_MS}\n\n"
+            idle = 0.0
+            while time.monotonic() < deadline:
+                line = f.readline()
+                if line.endswith(b"\n"):
+                    idle = 0.0
+                    text = line.decode("utf-8", errors="replace").rstrip()
+                    yield f"id: {f.tell()}\ndata: {text}\n\n"
+                    continue
+                # Riga incompleta: si rilegge al prossimo giro
+                f.seek(-len(line), os.SEEK_CUR)
+                time.sleep(LOG_STREAM_POLL)
+                idle += LOG_STREAM_POLL
+                if idle >= 15:
+                    # Commento SSE: mantiene viva la connessione e rileva i client chiusi
+                    idle = 0.0
+                    yield ": keep-alive\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@app.route('/status')
+def status():
+    """Stato del processo in background, per il polling della dashboard"""
+    snap = _state
+    return Response(
+        _dumps({"status": snap.status, "progress": snap.progress, "running": snap.running}),
+        mimetype="application/json"
+    )
 
 @app.route('/start_process', methods=['POST'])
 def start_process():
-    global process_running, process_status, process_progress
-    
-    if process_running:
-        return redirect(url_for('index', message="Il processo è già in esecuzione", error=True))
+    global _state, _future
     
-    process_status = "Avvio..."
-    process_progress = 0
+    # Controllo e avvio atomici: due click ravvicinati non avviano due processi
+    with _state_lock:
+        if _state.running or (_future is not None and not _future.done()):
+            return redirect(url_for('index', message="Il processo è già in esecuzione", error=True))
+        _state = replace(_state, running=True, status="Avvio...", progress=0, version=_state.version + 1)
+        _stop_event.clear()
     
-    # Avvia il processo in un thread separato
-    threading.Thread(target=process_task).start()
+    # Avvia il processo su un worker del pool
+    _future = _executor.submit(process_task)
     
     logger.info("Processo avviato")
     return redirect(url_for('index', message="Processo avviato con successo"))
 
 @app.route('/stop_process', methods=['POST'])
 def stop_process():
-    global process_running, process_status
-    
-    if not process_running:
+    if not _state.running:
         return redirect(url_for('index', message="Nessun processo in esecuzione", error=True))
     
-    process_running = False
-    process_status = "Interrotto"
+    _stop_event.set()
+    _update_state(running=False, status="Interrotto")
     
     logger.info("Processo interrotto")
     return redirect(url_for('index', message="Processo interrotto"))
@@ -546,133 +807,170 @@ def reset_parameters():
 def refresh_results():
     return redirect(url_for('index', message="Risultati aggiornati"))
 
-@app.route('/force_download', methods=['POST'])
-def force_download():
-    url = request.form.get('url', '')
+def run_test_pipeline(video_id):
+    """
+    Esegue il pipeline completo di test (download, trascrizione, clip, metadata)
+    su un singolo video. Gira su un worker del pool, non sul thread della richiesta.
     
-    if not url:
-        return redirect(url_for('index', message="URL non valido", error=True))
+    Returns:
+        str: Messaggio di riepilogo
+    """
+    # Assicura che i moduli del pipeline siano importati (di solito già fatto all'avvio)
+    _preload_heavy()
     
-    try:
-        logger.info(f"Modalità TEST avviata per URL: {url}")
-        
-        # Extract video ID from URL
-        import re
-        video_id_match = re.search(r'(?:youtube\.com/watch\?v=|youtu\.be/)([^&\n?#]+)', url)
-        if not video_id_match:
-            return redirect(url_for('index', message="URL del video non valido", error=True))
-        
-        video_id = video_id_match.group(1)
-        
-        # Load configuration
-        config = load_config()
-        
-        # Import required modules
-        from database import Database
-        from data.downloader import YouTubeShortsFinder
-        from ai.whisper_transcriber import WhisperTranscriber
-        from ai.gpt_captioner import GPTCaptioner
-        from processing.editor import VideoEditor
-        from monitoring.analyzer import PerformanceAnalyzer
-        
-        # Initialize components
-        db_path = config['paths']['database']
-        db = Database(db_path)
-        
-        finder = YouTubeShortsFinder(config, db)
-        transcriber = WhisperTranscriber(config)
-        captioner = GPTCaptioner(config)
-        editor = VideoEditor(config, db)
-        analyzer = PerformanceAnalyzer(config, db)
-        
-        logger.info(f"Componenti inizializzati per test video: {video_id}")
-        
-        # Step 1: Download video directly
-        video_data = finder.download_video_direct(video_id, force=True)
-        logger.info(f"Video scaricato: {video_data['title']}")
-        
-        # Step 2: Transcribe
-        language = config['app_settings']['selected_language']
-        transcription = transcriber.transcribe_video(
-            video_data['file_path'],
-            language=language,
-            save_srt=True
-        )
-        
-        key_moments = transcriber.find_key_moments(transcription)
-        transcription['key_moments'] = key_moments
-        logger.info("Trascrizione completata")
-        
-        # Step 3: Analyze viral potential
-        viral_analysis = captioner.analyze_viral_potential(
-            transcription, 
-            video_data.get('category', 'Entertainment')
-        )
-        logger.info("Analisi virale completata")
-        
-        # Step 4: Process into clips with fallback
-        clip_ids = editor.process_source_video(
-            video_data['id'], 
-            transcription,
-            viral_analysis
+    # Load configuration
+    config = load_config()
+    
+    # Il modello Whisper si carica in background, sovrapposto al download
+    whisper_executor = ThreadPoolExecutor(max_workers=1)
+    whisper_future = whisper_executor.submit(WhisperTranscriber, config)
+    whisper_executor.shutdown(wait=False)
+    
+    # Initialize components
+    db_path = config['paths']['database']
+    db = Database(db_path)
+    
+    finder = YouTubeShortsFinder(config, db)
+    captioner = GPTCaptioner(config)
+    editor = VideoEditor(config, db)
+    analyzer = PerformanceAnalyzer(config, db)
+    
+    logger.info(f"Componenti inizializzati per test video: {video_id}")
+    
+    # Step 1: Download video directly
+    video_data = finder.download_video_direct(video_id, force=True)
+    logger.info(f"Video scaricato: {video_data['title']}")
+    
+    # Step 2: Transcribe
+    transcriber = whisper_future.result()
+    language = config['app_settings']['selected_language']
+    transcription = transcriber.transcribe_video(
+        video_data['file_path'],
+        language=language,
+        save_srt=True
+    )
+    
+    key_moments = transcriber.find_key_moments(transcription)
+    transcription['key_moments'] = key_moments
+    logger.info("Trascrizione completata")
+    
+    # Step 3: Analyze viral potential
+    viral_analysis = captioner.analyze_viral_potential(
+        transcription, 
+        video_data.get('category', 'Entertainment')
+    )
+    logger.info("Analisi virale completata")
+    
+    # Step 4: Process into clips with fallback
+    clip_ids = editor.process_source_video(
+        video_data['id'], 
+        transcription,
+        viral_analysis
+    )
+    
+    if not clip_ids:
+        logger.warning(f"Sistema fallback non ha creato clip per video {video_data['id']}")
+    else:
+        logger.info(f"Create {len(clip_ids)} clip da {video_data['title']}")
+    
+    # Step 5: Generate metadata
+    if clip_ids:
+        # Tutte le clip in una sola query
+        placeholders = ','.join('?' * len(clip_ids))
+        clips = db.execute_query(
+            f"SELECT * FROM processed_clips WHERE id IN ({placeholders})",
+            tuple(clip_ids)
         )
         
-        if not clip_ids:
-            logger.warning(f"Sistema fallback non ha creato clip per video {video_data['id']}")
-        else:
-            logger.info(f"Create {len(clip_ids)} clip da {video_data['title']}")
+        # I segmenti sono ordinati nel tempo: finestra per ricerca binaria
+        segments = transcription['segments']
+        starts = [segment['start'] for segment in segments]
+        ends = [segment['end'] for segment in segments]
         
-        # Step 5: Generate metadata
-        for clip_id in clip_ids:
-            clip = db.execute_query(
-                "SELECT * FROM processed_clips WHERE id = ?", 
-                (clip_id,)
-            )[0]
-            
+        def clip_transcription(clip):
             # Extract clip transcription segment
-            clip_start = clip['start_time']
-            clip_end = clip['end_time']
-            
-            clip_segments = []
-            for segment in transcription['segments']:
-                if segment['start'] >= clip_start and segment['end'] <= clip_end:
-                    clip_segments.append(segment)
-                    
-            clip_transcription = {
-                'segments': clip_segments
-            }
-            
-            # Generate metadata
-            metadata = captioner.generate_video_metadata(clip, clip_transcription)
-            
-            # Update clip with metadata
-            db.execute_query(
-                """
-                UPDATE processed_clips
-                SET title = ?, description = ?, hashtags = ?
-                WHERE id = ?
-                """,
-                (
-                    metadata['title'],
-                    metadata['description'],
-                    ','.join(metadata['hashtags']),
-                    clip_id
-                )
-            )
-        
-        # Step 6: Generate report
-        report = analyzer.generate_performance_report()
-        logger.info("Report di test generato")
+            lo = bisect.bisect_left(starts, clip['start_time'])
+            hi = bisect.bisect_right(ends, clip['end_time'])
+            return {'segments': segments[lo:hi]}
         
-        db.close()
-        
-        return redirect(url_for('index', message=f"TEST COMPLETATO! Video: {video_data['title']}, Clip generate: {len(clip_ids)}"))
+        # Le chiamate GPT sono I/O-bound: si sovrappongono su più thread
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(clips)))) as executor:
+            metadata_list = list(executor.map(
+                lambda clip: captioner.generate_video_metadata(clip, clip_transcription(clip)),
+                clips
+            ))
         
+        # Update clips with metadata (and replace their hashtags) in a single transaction
+        db.update_clips_metadata(
+            (clip['id'], metadata['title'], metadata['description'], metadata['hashtags'])
+            for clip, metadata in zip(clips, metadata_list)
+        )
+    
+    # Step 6: Generate report
+    report = analyzer.generate_performance_report()
+    logger.info("Report di test generato")
+    
+    db.close()
+    
+    return f"TEST COMPLETATO! Video: {video_data['title']}, Clip generate: {len(clip_ids)}"
+
+def _run_test_job(video_id):
+    """Wrapper del job di test: registra l'errore e lo lascia nel Future"""
+    try:
+        return run_test_pipeline(video_id)
     except Exception as e:
-        logger.error(f"Errore nella modalità test: {e}")
-        import traceback
-        traceback.print_exc()
-        return redirect(url_for('index', message=f"Errore nella modalità test: {e}", error=True))
+        logger.exception(f"Errore nella modalità test: {e}")
+        raise
+
+def _prune_test_jobs():
+    """Dimentica i job conclusi più vecchi oltre MAX_TEST_JOBS (chiamare con _test_jobs_lock)"""
+    excess = len(_test_jobs) - MAX_TEST_JOBS + 1
+    if excess <= 0:
+        return
+    finished = [job_id for job_id, future in _test_jobs.items() if future.done()]
+    for job_id in finished[:excess]:
+        del _test_jobs[job_id]
+
+@app.route('/force_download', methods=['POST'])
+def force_download():
+    url = request.form.get('url', '')
+    
+    if not url:
+        return redirect(url_for('index', message="URL non valido", error=True))
+    
+    logger.info(f"Modalità TEST avviata per URL: {url}")
+    
+    # Extract video ID from URL
+    video_id_match = _YT_ID_RE.search(url)
+    if not video_id_match:
+        return redirect(url_for('index', message="URL del video non valido", error=True))
+    
+    video_id = video_id_match.group(1)
+    
+    # Il pipeline dura minuti: gira in background e la risposta torna subito (fire-and-poll)
+    job_id = uuid.uuid4().hex[:12]
+    with _test_jobs_lock:
+        _prune_test_jobs()
+        _test_jobs[job_id] = _test_executor.submit(_run_test_job, video_id)
+    
+    return redirect(url_for(
+        'index',
+        message=f"Test avviato per {video_id} (job {job_id}): stato su /test_status/{job_id}"
+    ))
+
+@app.route('/test_status/<job_id>')
+def test_status(job_id):
+    future = _test_jobs.get(job_id)
+    if future is None:
+        return jsonify({"error": "Job non trovato"}), 404
+    
+    if not future.done():
+        return jsonify({"done": False})
+    
+    error = future.exception()
+    if error is not None:
+        return jsonify({"done": True, "error": str(error)})
+    return jsonify({"done": True, "message": future.result()})
 
 # Avvio dell'applicazione
 if __name__ == "__main__":
@@ -685,4 +983,18 @@ if __name__ == "__main__":
     print("Apri il browser e vai a http://localhost:5000")
     print("Premi CTRL+C per terminare il server")
     
-    app.run(debug=True)
+    # Import dei moduli pesanti in background mentre il server parte
+    threading.Thread(target=_preload_heavy, daemon=True).start()
+    
+    # Server threaded senza reloader (che importerebbe tutto due volte); debugger solo con VS_DEBUG=1.
+    # In produzione un solo worker (lo stato è per processo) e thread in abbondanza:
+    # ogni tab aperto tiene un thread per /log_stream (fino a LOG_STREAM_MAX_AGE), più
+    # quelli per /status e i form. Es.: gunicorn -w 1 -k gthread --threads 32 web_viral_shorts:app
+    # (niente gevent: whisper e i worker in background sono CPU-bound e bloccherebbero il loop)
+    app.run(
+        host=os.getenv("VS_HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "5000")),
+        threaded=True,
+        debug=os.getenv("VS_DEBUG") == "1",
+        use_reloader=False
+    )
@@ -8,15 +8,24 @@ Consente di visualizzare, rinnovare o ripristinare i token di autenticazione.
 import os
 import sys
 import json
-import pickle
+import time
 import datetime
+import functools
 from pathlib import Path
 
+try:
+    import orjson
+    
+    def _loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _loads(data):
+        return json.loads(data)
+
+# Solo Credentials serve all'avvio: googleapiclient, oauthlib e transport
+# vengono importati nelle funzioni che li usano
 try:
     from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from googleapiclient.discovery import build
-    from google.auth.transport.requests import Request
 except ImportError:
     print("Librerie Google necessarie non installate.")
     print("Installa le dipendenze con:")
@@ -35,62 +44,131 @@ COLORS = {
 
 # Percorsi dei file
 CREDENTIALS_FILE = 'data/youtube_credentials.json'
-TOKEN_FILE = 'data/token.pickle'
+TOKEN_FILE = 'data/token.json'
+LEGACY_TOKEN_FILE = 'data/token.pickle'
 CONFIG_FILE = 'config.json'
 
+# Margine sotto il quale il token viene aggiornato (VS_FORCE_REFRESH=1 forza sempre)
+REFRESH_THRESHOLD = datetime.timedelta(minutes=10)
+
+# Directory già create/verificate in questo processo
+_DATA_READY = set()
+
+# Contenuto di CREDENTIALS_FILE già letto, invalidato quando cambia l'mtime
+_CREDS_CACHE = {}
+
+# Connessione HTTP condivisa (keep-alive) per tutte le chiamate di verifica
+_HTTP = None
+
+# Token già deserializzato, invalidato quando cambia l'mtime del file
+_TOKEN_CACHE = {'creds': None, 'mtime': None}
+
 # Scopes richiesti per l'API YouTube
 SCOPES = [
     'https://www.googleapis.com/auth/youtube.upload',
     'https://www.googleapis.com/auth/youtube'
 ]
 
+# Coppie (prefisso, suffisso) ANSI precalcolate per print_colored
+_WRAPPED = {color: (code, COLORS['RESET']) for color, code in COLORS.items()}
+
 def print_colored(message, color='INFO'):
     """Stampa un messaggio colorato sulla console."""
-    color_code = COLORS.get(color, COLORS['INFO'])
-    print(f"{color_code}{message}{COLORS['RESET']}")
+    prefix, suffix = _WRAPPED.get(color, _WRAPPED['INFO'])
+    sys.stdout.write(prefix + message + suffix + '\n')
+
+@functools.lru_cache(maxsize=None)
+def _banner(message, rule, color):
+    """Intestazione completa (righe + messaggio colorato), costruita una volta sola."""
+    prefix, suffix = _WRAPPED[color]
+    return f"\n{rule}\n{prefix} {message} {suffix}\n{rule}\n"
 
 def print_header(message):
     """Stampa un'intestazione formattata."""
-    print("\n" + "="*80)
-    print_colored(f" {message} ", 'HEADER')
-    print("="*80)
+    sys.stdout.write(_banner(message, "="*80, 'HEADER'))
 
 def print_section(message):
     """Stampa un'intestazione di sezione."""
-    print("\n" + "-"*60)
-    print_colored(f" {message} ", 'BOLD')
-    print("-"*60)
+    sys.stdout.write(_banner(message, "-"*60, 'BOLD'))
 
 def create_directory_if_not_exists(dir_path):
-    """Crea una directory se non esiste."""
+    """Crea una directory se non esiste (una sola volta per processo)."""
+    if dir_path in _DATA_READY:
+        return
     Path(dir_path).mkdir(parents=True, exist_ok=True)
+    _DATA_READY.add(dir_path)
+
+def _shared_http():
+    """Restituisce l'istanza httplib2 condivisa, creandola al primo utilizzo."""
+    global _HTTP
+    if _HTTP is None:
+        import httplib2
+        _HTTP = httplib2.Http(timeout=10)
+    return _HTTP
+
+@functools.lru_cache(maxsize=4)
+def get_youtube_service(credentials):
+    """Costruisce il client YouTube una sola volta per ciascun oggetto credenziali."""
+    from googleapiclient.discovery import build
+    from google_auth_httplib2 import AuthorizedHttp
+    return build('youtube', 'v3', http=AuthorizedHttp(credentials, http=_shared_http()))
 
 def load_token():
-    """Carica il token salvato."""
-    if os.path.exists(TOKEN_FILE):
-        with open(TOKEN_FILE, 'rb') as token:
-            return pickle.load(token)
-    return None
+    """Carica il token salvato (JSON, con migrazione dal vecchio file pickle)."""
+    try:
+        mtime = os.stat(TOKEN_FILE).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    
+    if mtime is not None:
+        if _TOKEN_CACHE['mtime'] == mtime:
+            return _TOKEN_CACHE['creds']
+        with open(TOKEN_FILE, 'r') as token:
+            credentials = Credentials.from_authorized_user_info(_loads(token.read()), SCOPES)
+        _TOKEN_CACHE.update(creds=credentials, mtime=mtime)
+        return credentials
+    
+    # Migrazione una tantum dal formato pickle precedente
+    try:
+        token = open(LEGACY_TOKEN_FILE, 'rb')
+    except FileNotFoundError:
+        return None
+    with token:
+        import pickle
+        credentials = pickle.load(token)
+    save_token(credentials)
+    os.remove(LEGACY_TOKEN_FILE)
+    print_colored("Token migrato dal formato pickle a JSON.", 'INFO')
+    return credentials
 
 def save_token(credentials):
-    """Salva il token in un file pickle."""
+    """Salva il token in un file JSON."""
     create_directory_if_not_exists(os.path.dirname(TOKEN_FILE))
-    with open(TOKEN_FILE, 'wb') as token:
-        pickle.dump(credentials, token)
+    # Scrittura atomica: un'interruzione non lascia un token corrotto
+    tmp_path = TOKEN_FILE + '.tmp'
+    with open(tmp_path, 'w') as token:
+        token.write(credentials.to_json())
+        token.flush()
+        os.fsync(token.fileno())
+    os.replace(tmp_path, TOKEN_FILE)
+    _TOKEN_CACHE.update(creds=credentials, mtime=os.stat(TOKEN_FILE).st_mtime_ns)
     print_colored("Token salvato con successo!", 'INFO')
 
+def load_client_secrets():
+    """Legge CREDENTIALS_FILE, riutilizzando il contenuto finché il file non cambia."""
+    mtime = os.stat(CREDENTIALS_FILE).st_mtime_ns
+    if _CREDS_CACHE.get('mtime') != mtime:
+        with open(CREDENTIALS_FILE, 'rb') as f:
+            _CREDS_CACHE.update(data=_loads(f.read()), mtime=mtime)
+    return _CREDS_CACHE['data']
+
 def get_credentials_info():
     """Ottiene e mostra le informazioni sulle credenziali salvate."""
     print_section("Informazioni sulle credenziali YouTube")
     
     # Controlla il file delle credenziali client
-    if not os.path.exists(CREDENTIALS_FILE):
-        print_colored(f"Il file delle credenziali ({CREDENTIALS_FILE}) non esiste.", 'ERROR')
-        return None
-    
     try:
-        with open(CREDENTIALS_FILE, 'r') as f:
-            creds_data = json.load(f)
+        creds_data = load_client_secrets()
         
         if 'installed' in creds_data:
             client_id = creds_data['installed']['client_id']
@@ -101,6 +179,9 @@ def get_credentials_info():
         else:
             print_colored("Il file delle credenziali non contiene la sezione 'installed'.", 'ERROR')
             return None
+    except FileNotFoundError:
+        print_colored(f"Il file delle credenziali ({CREDENTIALS_FILE}) non esiste.", 'ERROR')
+        return None
     except Exception as e:
         print_colored(f"Errore nella lettura del file delle credenziali: {e}", 'ERROR')
         return None
@@ -117,12 +198,13 @@ def get_credentials_info():
         # Mostra la scadenza se disponibile
         if hasattr(credentials, 'expiry'):
             expiry = credentials.expiry
-            now = datetime.datetime.now()
             if expiry:
                 print(f"Scadenza: {expiry}")
-                if expiry > now:
-                    diff = expiry - now
-                    print(f"Tempo rimanente: {diff.days} giorni, {diff.seconds//3600} ore")
+                # google-auth memorizza expiry come UTC naive
+                remaining = expiry.replace(tzinfo=datetime.timezone.utc).timestamp() - time.time()
+                if remaining > 0:
+                    days, rem = divmod(int(remaining), 86400)
+                    print(f"Tempo rimanente: {days} giorni, {rem//3600} ore")
                 else:
                     print_colored("Il token è scaduto e deve essere rinnovato.", 'WARNING')
     else:
@@ -143,7 +225,16 @@ def refresh_token():
         print_colored("Il token non contiene un refresh_token valido e non può essere aggiornato.", 'ERROR')
         return False
     
+    # Evita il round trip verso Google se il token è ancora valido a lungo
+    if os.environ.get('VS_FORCE_REFRESH') != '1' and credentials.valid and credentials.expiry:
+        remaining = credentials.expiry - datetime.datetime.utcnow()
+        if remaining > REFRESH_THRESHOLD:
+            print_colored(f"Token ancora valido per {int(remaining.total_seconds() // 60)} minuti, aggiornamento non necessario.", 'INFO')
+            print("Imposta VS_FORCE_REFRESH=1 per forzare l'aggiornamento.")
+            return True
+    
     try:
+        from google.auth.transport.requests import Request
         print("Tentativo di aggiornamento del token...")
         credentials.refresh(Request())
         save_token(credentials)
@@ -157,14 +248,20 @@ def force_new_authentication():
     """Forza una nuova autenticazione rimuovendo il token esistente."""
     print_section("Nuova autenticazione")
     
-    # Rimuovi il token esistente
-    if os.path.exists(TOKEN_FILE):
-        try:
-            os.remove(TOKEN_FILE)
-            print_colored("Token esistente rimosso.", 'INFO')
-        except Exception as e:
-            print_colored(f"Errore nella rimozione del token esistente: {e}", 'ERROR')
-            return False
+    # Rimuovi il token esistente (e l'eventuale vecchio file pickle)
+    try:
+        os.remove(LEGACY_TOKEN_FILE)
+    except FileNotFoundError:
+        pass
+    try:
+        os.remove(TOKEN_FILE)
+        print_colored("Token esistente rimosso.", 'INFO')
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print_colored(f"Errore nella rimozione del token esistente: {e}", 'ERROR')
+        return False
+    _TOKEN_CACHE.update(creds=None, mtime=None)
     
     # Verifica file delle credenziali
     if not os.path.exists(CREDENTIALS_FILE):
@@ -173,6 +270,8 @@ def force_new_authentication():
         return False
     
     try:
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        
         # Crea il flow di autenticazione
         flow = InstalledAppFlow.from_client_secrets_file(
             CREDENTIALS_FILE, SCOPES)
@@ -192,7 +291,7 @@ def force_new_authentication():
         save_token(credentials)
         
         # Verifica la validità del token
-        youtube = build('youtube', 'v3', credentials=credentials)
+        youtube = get_youtube_service(credentials)
         request = youtube.channels().list(part='snippet', mine=True)
         response = request.execute()
         
@@ -216,7 +315,7 @@ def test_token():
         return False
     
     try:
-        youtube = build('youtube', 'v3', credentials=credentials)
+        youtube = get_youtube_service(credentials)
         request = youtube.channels().list(part='snippet', mine=True)
         response = request.execute()
         
@@ -244,22 +343,31 @@ def show_menu():
     choice = input("\nScegli un'opzione (1-5): ")
     return choice
 
+# Azioni del menu principale
+MENU_ACTIONS = {
+    '1': get_credentials_info,
+    '2': test_token,
+    '3': refresh_token,
+    '4': force_new_authentication,
+}
+
 def main():
     """Funzione principale."""
+    # Storico e modifica della riga per input() (non disponibile ovunque)
+    try:
+        import readline  # noqa: F401
+    except ImportError:
+        pass
+    
     # Assicurati che la directory data esista
     create_directory_if_not_exists('data')
     
     while True:
-        choice = show_menu()
+        choice = show_menu().strip()
         
-        if choice == '1':
-            get_credentials_info()
-        elif choice == '2':
-            test_token()
-        elif choice == '3':
-            refresh_token()
-        elif choice == '4':
-            force_new_authentication()
+        action = MENU_ACTIONS.get(choice)
+        if action:
+            action()
         elif choice == '5':
             print_colored("Arrivederci!", 'INFO')
             break